@@ -1,40 +1,45 @@
 from lightdash.api_client import LightdashApiClient
+from lightdash.project_access import apply_project_access, fetch_access_lists, plan_projects_access
+from lightdash.retry import IDEMPOTENT_METHODS, RateLimiter, RetryPolicy
 import pandas as pd
 
 TARGET_URL = 'https://app.lightdash.cloud/api/v1/'
 TARGET_API_KEY = ''
-TARGET_PROJECT_ID = ''
-USER_PERMS_FILEPATH = '~/Documents/user_permission_list.csv' #This file should have "email" and "role" columns
-LIGHTDASH_ROLES = ['viewer', 'interactive_viewer', 'editor', 'developer', 'admin']
+TARGET_PROJECT_ID = '' # Used when the file has no "project_uuid" column
+USER_PERMS_FILEPATH = '~/Documents/user_permission_list.csv' #This file should have "email" and "role" columns, and optionally "project_uuid"
+RESULTS_FILEPATH = 'project_access_results.csv'
+MAX_WORKERS = 8
+REQUESTS_PER_SECOND = 20 # Shared by the requests of every project
 
 if __name__ == '__main__':
-    target = LightdashApiClient(TARGET_URL, TARGET_API_KEY, TARGET_PROJECT_ID)
+    # Setting a role is idempotent, so role updates (PATCH) are retried as well
+    target = LightdashApiClient(
+        TARGET_URL, TARGET_API_KEY, TARGET_PROJECT_ID, pool_size=MAX_WORKERS,
+        retry=RetryPolicy(methods=IDEMPOTENT_METHODS | {'PATCH'}),
+        rate_limiter=RateLimiter(rate=REQUESTS_PER_SECOND),
+    )
     df_user_perms_to_grant = pd.read_csv(USER_PERMS_FILEPATH)
+    if 'project_uuid' not in df_user_perms_to_grant.columns:
+        df_user_perms_to_grant['project_uuid'] = TARGET_PROJECT_ID
 
-    # Get all organization and project access attributes for users on the permission list into one dataframe
-    df_org_users=pd.DataFrame.from_dict(target.users(), orient='columns')
-    df_user_perms_to_grant=df_user_perms_to_grant.join(df_org_users.set_index('email'), on='email', rsuffix='_org')
+    print('Getting all users')
+    org_users = target.users()
+    project_uuids = df_user_perms_to_grant['project_uuid'].dropna().unique()
+    print(f'Getting access lists of {len(project_uuids)} project(s)')
+    access_lists, fetch_errors = fetch_access_lists(target, project_uuids, max_workers=MAX_WORKERS)
+    for project_uuid, error in fetch_errors.items():
+        print(f'Skipping: Could not get access list of project {project_uuid}: {error}')
 
-    df_user_access_current = pd.DataFrame.from_dict(target.get_project_access_list(TARGET_PROJECT_ID), orient='columns')
-    df_user_access_current.columns=['user_uuid', 'email', 'current_role', 'first_name','project_uuid','last_name']
-    df_combined = df_user_perms_to_grant.join(df_user_access_current.set_index('email'), on='email')
+    # Decide every grant, upgrade and skip up front from the organization users and project access lists
+    plan = plan_projects_access(df_user_perms_to_grant, org_users, access_lists)
+    for action, count in plan['action'].value_counts().items():
+        print(f'{action}: {count} row(s)')
 
-    for index, row in df_combined.iterrows():        
-        email = row['email']
-        new_role = row['role']
-        current_role = row['current_role']
-        has_existing_project_role = not pd.isnull(row['current_role'])
-        has_existing_org_role = not pd.isnull(row['role_org'])
-        access_json = {'sendEmail': False, 'role': new_role, 'email': email}
-        role_json = {'role': new_role}
-        
-        if not has_existing_org_role: 
-            print(f'Skipping: User {email} does not exist in organization')
-        elif not has_existing_project_role:
-            print(f'Granting role {new_role} to {email}')
-            target.grant_project_access_to_user(TARGET_PROJECT_ID, access_json)
-        elif LIGHTDASH_ROLES.index(current_role) < LIGHTDASH_ROLES.index(new_role):
-            print(f'Updating role for {email} from {current_role} to {new_role}')
-            target.update_project_access_for_user(TARGET_PROJECT_ID, row['user_uuid'], role_json)
-        elif LIGHTDASH_ROLES.index(current_role) >= LIGHTDASH_ROLES.index(new_role):
-            print(f'Skipping: {email} already has {current_role} access')
+    results = apply_project_access(target, plan, max_workers=MAX_WORKERS)
+    failed = results[results['status'] == 'error']
+    for project_uuid, email, error in zip(failed['projectUuid'], failed['email'], failed['error']):
+        print(f'Failed: {email} on project {project_uuid}: {error}')
+    results.to_csv(RESULTS_FILEPATH, index=False)
+    print(f"Granted or updated {(results['status'] == 'ok').sum()} access(es), "
+          f"{(results['status'] == 'error').sum()} failed, {(results['status'] == 'skipped').sum()} skipped. "
+          f"Results saved to {RESULTS_FILEPATH}")
@@ -0,0 +1,549 @@
+"""Offline stand-in for the Lightdash API, for benchmarks and trying scripts without an instance.
+
+Serves a synthetic organization from memory with the endpoints LightdashApiClient and the
+example scripts use. Every request can be delayed by `latency` seconds and can fail with a
+503 (`error_rate`) or a 429 with Retry-After (`throttle_rate`).
+
+    poetry run python -m benchmarks.mock_server --users 10000 --port 8080
+
+then point a script at http://127.0.0.1:8080/api/v1/ with any API key.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ROLES = ['viewer', 'interactive_viewer', 'editor', 'developer', 'admin']
+ORG_ROLES = ['member', 'viewer', 'interactive_viewer', 'editor', 'developer', 'admin']
+
+
+class SyntheticOrg:
+    """A deterministic organization: users, groups, projects with spaces, charts and dashboards"""
+
+    def __init__(self, users=1000, groups=20, group_size=50, projects=2, spaces=10,
+                 charts_per_space=10, dashboards_per_space=3, tiles_per_dashboard=4, seed=0):
+        self._random = random.Random(seed)
+        self.organization = {'uuid': self.uuid(), 'name': 'Synthetic org'}
+        self.users = [self._user(i) for i in range(users)]
+        self.users_by_uuid = {user['userUuid']: user for user in self.users}
+        self.users_by_email = {user['email']: user for user in self.users}
+        self.groups = [self._group(i, group_size) for i in range(groups)]
+        for group in self.groups:
+            for member_uuid in group['memberUuids']:
+                self.users_by_uuid[member_uuid]['groups'].append({'uuid': group['uuid'], 'name': group['name']})
+        self.projects = {}
+        self.spaces = {}
+        self.charts = {}
+        self.dashboards = {}
+        self.access = {}
+        self.group_accesses = {}
+        for i in range(projects):
+            project_uuid = self.uuid()
+            self.projects[project_uuid] = {'projectUuid': project_uuid, 'name': f'Project {i}',
+                                           'organizationUuid': self.organization['uuid']}
+            for j in range(spaces):
+                space = self.add_space(project_uuid, {'name': f'Space {j}', 'isPrivate': j % 5 == 4})
+                charts = [
+                    self.add_chart(project_uuid, {'name': f'Chart {j}.{k}', 'spaceUuid': space['uuid']})
+                    for k in range(charts_per_space)
+                ]
+                for k in range(dashboards_per_space):
+                    tiles = [
+                        {'uuid': self.uuid(), 'type': 'saved_chart',
+                         'properties': {'savedChartUuid': chart['uuid'], 'belongsToDashboard': False}}
+                        for chart in self._random.sample(charts, min(tiles_per_dashboard, len(charts)))
+                    ] + [{'uuid': self.uuid(), 'type': 'markdown', 'properties': {'title': '', 'content': 'Notes'}}]
+                    self.add_dashboard(project_uuid, {
+                        'name': f'Dashboard {j}.{k}', 'spaceUuid': space['uuid'], 'tiles': tiles,
+                        'filters': {'dimensions': [], 'metrics': [], 'tableCalculations': []},
+                    })
+            members = self._random.sample(self.users, len(self.users) // 5)
+            self.access[project_uuid] = {
+                user['userUuid']: self.access_entry(user, project_uuid, self._random.choice(ROLES)) for user in members
+            }
+            self.group_accesses[project_uuid] = [
+                {'groupUuid': group['uuid'], 'projectUuid': project_uuid, 'role': self._random.choice(ROLES)}
+                for group in self._random.sample(self.groups, len(self.groups) // 2)
+            ]
+        self.attributes = {}
+        for name in ('region', 'team'):
+            self.add_attribute({'name': name, 'description': f'Synthetic {name}', 'users': [
+                {'userUuid': user['userUuid'], 'email': user['email'], 'value': f'{name}-{i % 7}'}
+                for i, user in enumerate(self.users[::3])
+            ]})
+
+    def uuid(self):
+        return str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+
+    def _timestamp(self):
+        return time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(1_650_000_000 + self._random.randrange(120_000_000)))
+
+    def _user(self, i):
+        return {
+            'userUuid': self.uuid(),
+            'firstName': f'First{i}',
+            'lastName': f'Last{i}',
+            'email': f'user{i}@example.com',
+            'role': self._random.choices(ORG_ROLES, weights=[10, 30, 20, 8, 3, 1])[0],
+            'isActive': True,
+            'isInviteExpired': False,
+            'groups': [],
+        }
+
+    def _group(self, i, group_size):
+        members = self._random.sample(self.users, min(group_size, len(self.users)))
+        return {
+            'uuid': self.uuid(),
+            'name': f'Group {i}',
+            'createdAt': self._timestamp(),
+            'organizationUuid': self.organization['uuid'],
+            'memberUuids': [user['userUuid'] for user in members],
+        }
+
+    @staticmethod
+    def _member(user):
+        return {key: user[key] for key in ('userUuid', 'email', 'firstName', 'lastName')}
+
+    @staticmethod
+    def access_entry(user, project_uuid, role):
+        # Same key order as the API
+        return {'userUuid': user['userUuid'], 'email': user['email'], 'role': role,
+                'firstName': user['firstName'], 'projectUuid': project_uuid, 'lastName': user['lastName']}
+
+    def group(self, group_uuid, include_members=None, offset=0):
+        group = next((g for g in self.groups if g['uuid'] == group_uuid), None)
+        if group is None:
+            return None
+        member_uuids = group['memberUuids']
+        if include_members is not None:
+            member_uuids = member_uuids[offset:offset + include_members]
+        return {**group, 'members': [self._member(self.users_by_uuid[u]) for u in member_uuids]}
+
+    def add_space(self, project_uuid, space):
+        space_uuid = self.uuid()
+        self.spaces[space_uuid] = {
+            'uuid': space_uuid, 'name': space['name'], 'isPrivate': space.get('isPrivate', False),
+            'parentSpaceUuid': space.get('parentSpaceUuid'), 'projectUuid': project_uuid,
+            'createdAt': self._timestamp(), 'views': self._random.randrange(500),
+        }
+        return self.space(space_uuid)
+
+    def space(self, space_uuid):
+        space = self.spaces[space_uuid]
+        return {
+            **space,
+            'queries': [
+                {key: chart.get(key) for key in ('uuid', 'name', 'spaceUuid', 'updatedAt')}
+                for chart in self.charts.values() if chart.get('spaceUuid') == space_uuid
+            ],
+            'dashboards': [
+                {key: dashboard.get(key) for key in ('uuid', 'name', 'spaceUuid', 'updatedAt')}
+                for dashboard in self.dashboards.values() if dashboard.get('spaceUuid') == space_uuid
+            ],
+        }
+
+    def add_chart(self, project_uuid, chart):
+        chart_uuid = self.uuid()
+        self.charts[chart_uuid] = {
+            'tableName': 'orders',
+            'metricQuery': {'exploreName': 'orders', 'dimensions': ['orders_status'],
+                            'metrics': ['orders_count'], 'filters': {}, 'sorts': [], 'limit': 500},
+            'chartConfig': {'type': 'cartesian', 'config': {}},
+            'tableConfig': {'columnOrder': []},
+            **chart,
+            'uuid': chart_uuid,
+            'projectUuid': project_uuid,
+            'updatedAt': self._timestamp(),
+            'views': self._random.choice([0, 0, 1, 3, 12, 40, 250, 1200]),
+        }
+        return self.charts[chart_uuid]
+
+    def add_dashboard(self, project_uuid, dashboard):
+        dashboard_uuid = self.uuid()
+        self.dashboards[dashboard_uuid] = {
+            'description': '' if self._random.random() < 0.4 else 'Synthetic dashboard',
+            'tiles': [],
+            'filters': {'dimensions': [], 'metrics': [], 'tableCalculations': []},
+            **dashboard,
+            'uuid': dashboard_uuid,
+            'projectUuid': project_uuid,
+            'createdAt': self._timestamp(),
+            'updatedAt': self._timestamp(),
+            'views': self._random.choice([0, 0, 1, 3, 12, 40, 250, 1200]),
+        }
+        return self.dashboards[dashboard_uuid]
+
+    def add_attribute(self, attribute):
+        attribute_uuid = self.uuid()
+        self.attributes[attribute_uuid] = {'groups': [], **attribute, 'uuid': attribute_uuid}
+        return self.attributes[attribute_uuid]
+
+    def content(self, content_types=None, project_uuids=None):
+        """Items in the shape of /api/v2/content"""
+        creator = self.users[0] if self.users else {'userUuid': None, 'firstName': '', 'lastName': ''}
+        person = {'uuid': creator['userUuid'], 'firstName': creator['firstName'], 'lastName': creator['lastName']}
+        sources = {'chart': self.charts.values(), 'dashboard': self.dashboards.values(), 'space': self.spaces.values()}
+        for content_type in content_types or sources:
+            for item in sources.get(content_type, ()):
+                if project_uuids and item['projectUuid'] not in project_uuids:
+                    continue
+                space = self.spaces.get(item.get('spaceUuid', item['uuid']), {})
+                yield {
+                    'contentType': content_type,
+                    'uuid': item['uuid'],
+                    'slug': item['name'].lower().replace(' ', '-'),
+                    'name': item['name'],
+                    'description': item.get('description'),
+                    'createdAt': item.get('createdAt') or item.get('updatedAt'),
+                    'createdBy': person,
+                    'lastUpdatedAt': item.get('updatedAt') or item.get('createdAt'),
+                    'lastUpdatedBy': person,
+                    'project': {'uuid': item['projectUuid'], 'name': self.projects[item['projectUuid']]['name']},
+                    'organization': self.organization,
+                    'space': {'uuid': space.get('uuid'), 'name': space.get('name')},
+                    'pinnedList': None,
+                    'views': item.get('views', 0),
+                    'firstViewedAt': None,
+                }
+
+
+def _page(items, query, total_key='totalPageCount'):
+    page = int(query.get('page', 1))
+    page_size = int(query.get('pageSize', 100))
+    return {
+        'data': items[(page - 1) * page_size:page * page_size],
+        'pagination': {
+            'page': page,
+            'pageSize': page_size,
+            'totalResults': len(items),
+            total_key: -(-len(items) // page_size) if page_size else 0,
+        },
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this, delayed ACKs add ~40ms per response
+    disable_nagle_algorithm = True
+    routes = []
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._reply(status, {'status': 'error', 'error': {'statusCode': status, 'name': 'Error', 'message': message}})
+
+    def _handle(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        url = urlparse(self.path)
+        query = {key: values[0] if len(values) == 1 else values for key, values in parse_qs(url.query).items()}
+        server = self.server
+        if url.path == '/__stats':
+            return self._reply(200, server.stats(reset=query.get('reset') == '1'))
+        server.count(method)
+        if server.latency:
+            time.sleep(server.latency)
+        if server.roll(server.throttle_rate):
+            return self._reply(429, {'status': 'error', 'error': {'statusCode': 429, 'message': 'Too many requests'}},
+                               {'Retry-After': '0'})
+        if server.roll(server.error_rate):
+            return self._error(503, 'Injected failure')
+        for route_method, pattern, handler in self.routes:
+            match = pattern.fullmatch(url.path)
+            if route_method == method and match:
+                with server.lock:
+                    results = handler(server.org, query, body, *match.groups())
+                if results is None:
+                    return self._error(404, f'Not found: {url.path}')
+                return self._reply(200, {'status': 'ok', 'results': results})
+        self._error(404, f'No route for {method} {url.path}')
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+
+def route(method, pattern):
+    def register(handler):
+        _Handler.routes.append((method, re.compile('/api/v[12]' + pattern), handler))
+        return handler
+    return register
+
+
+@route('GET', '/health')
+def _health(org, query, body):
+    return {'healthy': True, 'mode': 'mock'}
+
+
+@route('GET', '/org/users')
+def _org_users(org, query, body):
+    if 'page' not in query:
+        return org.users
+    return _page(org.users, query)
+
+
+@route('GET', '/org/groups')
+def _org_groups(org, query, body):
+    include_members = int(query.get('includeMembers', 0))
+    groups = [org.group(group['uuid'], include_members) for group in org.groups]
+    if 'page' not in query:
+        return {'data': groups}
+    return _page(groups, query)
+
+
+@route('GET', '/groups/([^/]+)')
+def _group(org, query, body, group_uuid):
+    include_members = int(query['includeMembers']) if 'includeMembers' in query else None
+    return org.group(group_uuid, include_members, int(query.get('offset', 0)))
+
+
+@route('GET', '/org/attributes')
+def _attributes(org, query, body):
+    return list(org.attributes.values())
+
+
+@route('POST', '/org/attributes')
+def _create_attribute(org, query, body):
+    return org.add_attribute(body)
+
+
+@route('PUT', '/org/attributes/([^/]+)')
+def _update_attribute(org, query, body, attribute_uuid):
+    if attribute_uuid not in org.attributes:
+        return None
+    org.attributes[attribute_uuid] = {**org.attributes[attribute_uuid], **body, 'uuid': attribute_uuid}
+    return org.attributes[attribute_uuid]
+
+
+@route('GET', '/projects/([^/]+)')
+def _project(org, query, body, project_uuid):
+    return org.projects.get(project_uuid)
+
+
+@route('GET', '/projects/([^/]+)/spaces')
+def _spaces(org, query, body, project_uuid):
+    return [org.space(u) for u, space in org.spaces.items() if space['projectUuid'] == project_uuid]
+
+
+@route('POST', '/projects/([^/]+)/spaces')
+def _create_space(org, query, body, project_uuid):
+    return org.add_space(project_uuid, body)
+
+
+@route('GET', '/projects/([^/]+)/spaces/([^/]+)')
+def _space(org, query, body, project_uuid, space_uuid):
+    return org.space(space_uuid) if space_uuid in org.spaces else None
+
+
+@route('PATCH', '/projects/([^/]+)/spaces/([^/]+)')
+def _update_space(org, query, body, project_uuid, space_uuid):
+    if space_uuid not in org.spaces:
+        return None
+    org.spaces[space_uuid].update(body)
+    return org.space(space_uuid)
+
+
+@route('DELETE', '/projects/([^/]+)/spaces/([^/]+)')
+def _delete_space(org, query, body, project_uuid, space_uuid):
+    return {} if org.spaces.pop(space_uuid, None) is not None else None
+
+
+@route('GET', '/saved/([^/]+)')
+def _chart(org, query, body, chart_uuid):
+    return org.charts.get(chart_uuid)
+
+
+@route('POST', '/projects/([^/]+)/saved')
+def _create_chart(org, query, body, project_uuid):
+    return org.add_chart(project_uuid, {key: value for key, value in body.items() if key != 'uuid'})
+
+
+@route('GET', '/dashboards/([^/]+)')
+def _dashboard(org, query, body, dashboard_uuid):
+    return org.dashboards.get(dashboard_uuid)
+
+
+@route('POST', '/projects/([^/]+)/dashboards')
+def _create_dashboard(org, query, body, project_uuid):
+    return org.add_dashboard(project_uuid, {key: value for key, value in body.items() if key != 'uuid'})
+
+
+@route('PATCH', '/dashboards/([^/]+)')
+def _update_dashboard(org, query, body, dashboard_uuid):
+    if dashboard_uuid not in org.dashboards:
+        return None
+    org.dashboards[dashboard_uuid].update(body)
+    return org.dashboards[dashboard_uuid]
+
+
+@route('GET', '/projects/([^/]+)/access')
+def _access(org, query, body, project_uuid):
+    return list(org.access.get(project_uuid, {}).values())
+
+
+@route('POST', '/projects/([^/]+)/access')
+def _grant_access(org, query, body, project_uuid):
+    user = org.users_by_email.get(body['email'])
+    if user is None or project_uuid not in org.access:
+        return None
+    org.access[project_uuid][user['userUuid']] = org.access_entry(user, project_uuid, body['role'])
+    return {}
+
+
+@route('PATCH', '/projects/([^/]+)/access/([^/]+)')
+def _update_access(org, query, body, project_uuid, user_uuid):
+    access = org.access.get(project_uuid, {}).get(user_uuid)
+    if access is None:
+        return None
+    access['role'] = body['role']
+    return {}
+
+
+@route('GET', '/projects/([^/]+)/user/([^/]+)')
+def _member_access(org, query, body, project_uuid, user_uuid):
+    return org.access.get(project_uuid, {}).get(user_uuid)
+
+
+@route('GET', '/projects/([^/]+)/groupAccesses')
+def _group_accesses(org, query, body, project_uuid):
+    return org.group_accesses.get(project_uuid, [])
+
+
+@route('GET', '/content')
+def _content(org, query, body):
+    def as_list(value):
+        return value if isinstance(value, list) else [value] if value else None
+
+    items = list(org.content(as_list(query.get('contentTypes')), as_list(query.get('projectUuids'))))
+    sort_key = {'last_updated_at': 'lastUpdatedAt', 'space_name': 'space'}.get(query.get('sortBy'), 'name')
+    items.sort(
+        key=lambda item: (item[sort_key]['name'] if sort_key == 'space' else item[sort_key]) or '',
+        reverse=query.get('sortDirection') == 'desc',
+    )
+    return _page(items, query, total_key='totalPages')
+
+
+class MockLightdashServer(ThreadingHTTPServer):
+    """Serves a SyntheticOrg on a background thread. Use port 0 for any free port."""
+    daemon_threads = True
+
+    def __init__(self, org=None, host='127.0.0.1', port=0, latency=0.0, error_rate=0.0, throttle_rate=0.0, seed=0):
+        super().__init__((host, port), _Handler)
+        self.org = org if org is not None else SyntheticOrg(seed=seed)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._counts = {}
+        self._counts_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        """Base URL for LightdashApiClient"""
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/api/v1/'
+
+    def roll(self, rate):
+        if not rate:
+            return False
+        with self._counts_lock:
+            return self._random.random() < rate
+
+    def count(self, method):
+        with self._counts_lock:
+            self._counts[method] = self._counts.get(method, 0) + 1
+
+    def stats(self, reset=False):
+        with self._counts_lock:
+            counts = dict(self._counts)
+            if reset:
+                self._counts.clear()
+        return {'requests': sum(counts.values()), 'byMethod': counts}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def add_org_arguments(parser):
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--groups', type=int, default=20)
+    parser.add_argument('--group-size', type=int, default=50)
+    parser.add_argument('--projects', type=int, default=2)
+    parser.add_argument('--spaces', type=int, default=10, help='spaces per project')
+    parser.add_argument('--charts-per-space', type=int, default=10)
+    parser.add_argument('--dashboards-per-space', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests failing with 503')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fraction of requests answered with 429')
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def server_from_args(args, host='127.0.0.1', port=0):
+    org = SyntheticOrg(
+        users=args.users, groups=args.groups, group_size=args.group_size, projects=args.projects,
+        spaces=args.spaces, charts_per_space=args.charts_per_space,
+        dashboards_per_space=args.dashboards_per_space, seed=args.seed,
+    )
+    return MockLightdashServer(org, host, port, args.latency, args.error_rate, args.throttle_rate, args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_org_arguments(parser)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    args = parser.parse_args()
+    server = server_from_args(args, args.host, args.port)
+    print(f'Mock Lightdash serving {len(server.org.users)} users and {len(server.org.projects)} projects '
+          f'at {server.url}', flush=True)
+    for project_uuid, project in server.org.projects.items():
+        print(f'  {project["name"]}: {project_uuid}', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""Benchmark the example workloads against the offline mock server.
+
+    poetry run python -m benchmarks.run --users 20000 --latency 0.02 --workloads copy,audit,export
+
+Each workload runs in its own process so its peak RSS is measured on its own. Reports the
+number of requests the mock server received, wall time, requests per second and peak RSS.
+"""
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.mock_server import add_org_arguments, server_from_args
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def copy_workload(url, project_uuids, max_workers):
+    """Copy every space, chart and dashboard of the first project into the last one"""
+    from lightdash.api_client import LightdashApiClient
+    from lightdash.space_copy import SpaceCopier
+
+    source = LightdashApiClient(url, 'mock', project_uuids[0], max_workers=max_workers)
+    target = LightdashApiClient(url, 'mock', project_uuids[-1], max_workers=max_workers)
+    copier = SpaceCopier(source, target, max_workers=max_workers)
+    copier.run()
+    return len(copier.chart_uuid_map) + len(copier.dashboard_uuid_map) + len(copier.space_uuid_map)
+
+
+def audit_workload(url, project_uuids, max_workers):
+    """Effective role of every user on every project"""
+    from lightdash.access import compute_access_matrix
+    from lightdash.api_client import LightdashApiClient
+
+    client = LightdashApiClient(url, 'mock', max_workers=max_workers)
+    return len(compute_access_matrix(client, project_uuids, max_workers=max_workers))
+
+
+def export_workload(url, project_uuids, max_workers):
+    """Users, groups and dashboards exports of the example scripts, written to a temporary directory"""
+    import find_dashboards
+    import get_all_organization_groups
+    import get_all_organization_users
+    from lightdash.export import stream_export
+
+    root = url.split('/api/v1/')[0]
+    get_all_organization_users.API_URL = f'{url}org/users'
+    get_all_organization_groups.API_URL = f'{url}org/groups'
+    get_all_organization_groups.GROUP_URL = f'{url}groups/{{group_uuid}}'
+    find_dashboards.API_URL = root
+    rows = 0
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        rows += stream_export(
+            get_all_organization_users.iter_users(), 'users.csv', get_all_organization_users.USER_COLUMNS
+        )
+        rows += stream_export(
+            get_all_organization_groups.iter_group_members(get_all_organization_groups.iter_groups()),
+            'groups.csv', get_all_organization_groups.GROUP_COLUMNS,
+        )
+        dashboards = find_dashboards.parse_dashboards(find_dashboards.fetch_all_dashboards(project_uuids))
+        find_dashboards.export_dashboards(dashboards, 'csv')
+        rows += len(dashboards)
+        os.chdir(PYTHON_DIR)
+    return rows
+
+
+WORKLOADS = {'copy': copy_workload, 'audit': audit_workload, 'export': export_workload}
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def run_worker(name, url, project_uuids, max_workers):
+    """Run one workload in this process and print its measurements as JSON"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        items = WORKLOADS[name](url, project_uuids, max_workers)
+        wall = time.perf_counter() - start
+    print(json.dumps({'workload': name, 'items': items, 'wall': wall, 'peakRssMb': peak_rss_mb()}))
+
+
+def run_workload(server, name, max_workers):
+    server.stats(reset=True)
+    process = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.run', '--worker', name, '--url', server.url,
+         '--project-uuids', ','.join(server.org.projects), '--max-workers', str(max_workers)],
+        cwd=PYTHON_DIR, capture_output=True, text=True,
+    )
+    if process.returncode != 0:
+        # e.g. a script without retries hitting an injected error
+        error = (process.stderr.strip().splitlines() or [f'exit code {process.returncode}'])[-1]
+        return {'workload': name, 'error': error, 'requests': server.stats()['requests']}
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    result['requests'] = server.stats()['requests']
+    result['requestsPerSecond'] = result['requests'] / result['wall'] if result['wall'] else 0
+    return result
+
+
+def print_results(results):
+    print(f"{'workload':<10} {'items':>8} {'requests':>9} {'wall s':>8} {'req/s':>8} {'peak RSS MB':>12}")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['workload']:<10} failed after {r['requests']} requests: {r['error']}")
+            continue
+        rss = f"{r['peakRssMb']:.1f}" if r['peakRssMb'] is not None else 'n/a'
+        print(f"{r['workload']:<10} {r['items']:>8} {r['requests']:>9} {r['wall']:>8.2f} "
+              f"{r['requestsPerSecond']:>8.1f} {rss:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_org_arguments(parser)
+    parser.add_argument('--workloads', default=','.join(WORKLOADS), help='comma separated, from: ' + ', '.join(WORKLOADS))
+    parser.add_argument('--repeat', type=int, default=1, help='runs per workload')
+    parser.add_argument('--max-workers', type=int, default=8)
+    parser.add_argument('--output', help='also write the results to this JSON file')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--url', help=argparse.SUPPRESS)
+    parser.add_argument('--project-uuids', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_worker(args.worker, args.url, args.project_uuids.split(','), args.max_workers)
+
+    names = [name for name in args.workloads.split(',') if name]
+    unknown = set(names) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"unknown workloads: {', '.join(sorted(unknown))}")
+    print(f'Generating synthetic organization with {args.users} users...', flush=True)
+    with server_from_args(args) as server:
+        print(f'Mock server at {server.url} (latency {args.latency}s, error rate {args.error_rate}, '
+              f'throttle rate {args.throttle_rate})', flush=True)
+        results = []
+        for name in names:
+            for run in range(args.repeat):
+                print(f'Running {name} ({run + 1}/{args.repeat})...', flush=True)
+                results.append(run_workload(server, name, args.max_workers))
+    print()
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,8 @@
+import sys
+
 from lightdash.api_client import LightdashApiClient
+from lightdash.checkpoint import CopyJournal
+from lightdash.space_copy import SpaceCopier
 
 # Lightdash space to copy
 SOURCE_URL = 'https://app.lightdash.cloud/api/v1/'
@@ -10,75 +14,30 @@ TARGET_URL = 'https://eu1.lightdash.cloud/api/v1/'
 TARGET_API_KEY = ''
 TARGET_PROJECT_ID = ''
 
-if __name__ == '__main__':
-    source_client = LightdashApiClient(SOURCE_URL, SOURCE_API_KEY, SOURCE_PROJECT_ID)
-    target_client = LightdashApiClient(TARGET_URL, TARGET_API_KEY, TARGET_PROJECT_ID)
-
-    # Get all spaces
-    print('Getting all spaces')
-    all_spaces = source_client.spaces(summary=True)
-    SPACE_UUID_MAP = {}
-    for idx, s in enumerate(all_spaces):
-        new_space = {'name': s['name'], 'isPrivate': s['isPrivate']}
-        print(f'Coping space {idx+1} of {len(all_spaces)}: {new_space["name"]}')
-        new_space = target_client.create_empty_space(new_space)
-        SPACE_UUID_MAP[s["uuid"]] = new_space["uuid"]
-
-    print('Getting all spaces and content')
-    full_spaces = []
-    for s in all_spaces:
-        print(f'Getting all charts and dashboards for space {s["name"]}')
-        full_spaces.append(source_client.space(s["uuid"], summary=False))
-    full_spaces = [source_client.space(s["uuid"], summary=False) for s in all_spaces]
-    all_charts = [chart for space in full_spaces for chart in space["queries"]]
-    all_dashboards = [dashboard for space in full_spaces for dashboard in space["dashboards"]]
+# Number of objects fetched and created concurrently
+MAX_WORKERS = 8
 
-    CHART_UUID_MAP = {}
-    for idx, chart in enumerate(all_charts):
-        print(f'Copying chart {idx+1} of {len(all_charts)}: {chart["name"]}')
-        new_chart = target_client.create_saved_chart({**chart, 'spaceUuid': SPACE_UUID_MAP[chart["spaceUuid"]]})
-        CHART_UUID_MAP[chart["uuid"]] = new_chart["uuid"]
-
-    for idx, dashboard in enumerate(all_dashboards):
-        print(f'Copying dashboard {idx+1} of {len(all_dashboards)}: {dashboard["name"]}')
-        new_dashboard = {
-            'name': dashboard['name'],
-            'description': dashboard.get('description', ''),
-            'spaceUuid': SPACE_UUID_MAP[dashboard["spaceUuid"]],
-            'tiles': []
-        }
-        if dashboard.get('filters'):
-            new_dashboard['filters'] = dashboard['filters']
-        new_dashboard = target_client.create_dashboard(new_dashboard)
-
-        tiles = dashboard.get("tiles")
-        if tiles:
-            print(f'Copying {len(tiles)} tiles')
-            new_tiles = []
-            for idx, tile in enumerate(tiles):
-                if tile['type'] == 'saved_chart':
-                    if "belongsToDashboard" in tile["properties"] and tile["properties"]["belongsToDashboard"] == True:
-                        print(f'Copying chart that belongs to dashboard: {tile["properties"]["chartName"]}')
-                        chart = source_client.saved_chart(tile['properties']['savedChartUuid'])
-                        if 'spaceUuid' in chart:
-                            chart['spaceUuid'] = SPACE_UUID_MAP[chart['spaceUuid']]
-                        new_chart = target_client.create_saved_chart({**chart, 'dashboardUuid': new_dashboard["uuid"]})
-                        CHART_UUID_MAP[chart["uuid"]] = new_chart["uuid"]
-
-                    new_tiles.append({
-                          **tile,
-                          'properties': {
-                              **tile['properties'],
-                              # try to get the new id but if it was already a broken reference, use the old id
-                              'savedChartUuid': CHART_UUID_MAP.get(tile['properties']['savedChartUuid'], tile['properties']['savedChartUuid'])
-                          }
-                      })
-                else:
-                    new_tiles.append(tile)
-            target_client.update_dashboard(new_dashboard["uuid"], {
-                'filters': new_dashboard.get('filters'),
-                'tiles': new_tiles
-            })
-        else:
-           print(f'No tiles to copy')
+# Every created space, chart and dashboard is recorded here as soon as it exists.
+# Set RESUME = True to re-run a failed copy and skip everything already copied. The journal
+# records the source and target above, and resuming it for a different copy fails.
+CHECKPOINT_PATH = 'copy_space_checkpoint.jsonl'
+RESUME = False
 
+if __name__ == '__main__':
+    source_client = LightdashApiClient(SOURCE_URL, SOURCE_API_KEY, SOURCE_PROJECT_ID,
+                                       pool_size=MAX_WORKERS, max_workers=MAX_WORKERS)
+    target_client = LightdashApiClient(TARGET_URL, TARGET_API_KEY, TARGET_PROJECT_ID,
+                                       pool_size=MAX_WORKERS, max_workers=MAX_WORKERS)
+
+    copy = {
+        'sourceUrl': SOURCE_URL, 'sourceProjectUuid': SOURCE_PROJECT_ID,
+        'targetUrl': TARGET_URL, 'targetProjectUuid': TARGET_PROJECT_ID,
+    }
+    with CopyJournal(CHECKPOINT_PATH, resume=RESUME, header=copy) as journal:
+        copier = SpaceCopier(source_client, target_client, max_workers=MAX_WORKERS, journal=journal)
+        copier.run()
+        copier.print_report()
+
+    if copier.errors:
+        # A partial copy must not look like a successful one, e.g. to a scheduler or CI job
+        sys.exit(1)
@@ -1,66 +1,53 @@
 from lightdash.api_client import LightdashApiClient
+from lightdash.attributes import apply_attribute_updates, attribute_rows, email_index, plan_attribute_updates
 import pandas as pd
 
 # Update these variables
 TARGET_URL = 'https://app.lightdash.cloud/api/v1/'
 TARGET_API_KEY = ''
-CSV_FILEPATH = '~/Documents/user_attributes_list.csv' #This file should have "email" and "value" columns
+# This file should have either:
+# - "email" and "value" columns, for the attribute ATTRIBUTE_NAME
+# - "email", "attribute" and "value" columns, one row per user and attribute
+# - an "email" column and one column per attribute name (empty cells are ignored)
+CSV_FILEPATH = '~/Documents/user_attributes_list.csv'
 ATTRIBUTE_NAME = ''
+MAX_WORKERS = 8
 
 
 if __name__ == "__main__":
     target = LightdashApiClient(TARGET_URL, TARGET_API_KEY)
-    df_user_attributes_to_grant = pd.read_csv(CSV_FILEPATH)
+    # Read values as text, attribute values are strings
+    df_user_attributes_to_grant = attribute_rows(
+        pd.read_csv(CSV_FILEPATH, dtype=str, keep_default_na=False), ATTRIBUTE_NAME
+    )
 
     print("Getting all users")
-    df_users = pd.DataFrame.from_dict(target.users(), orient='columns')
+    users = email_index(target.users())
     print("Getting all user attributes")
-    df_user_attributes=pd.DataFrame.from_dict(target.user_attributes(), orient='columns')
+    attributes = target.user_attributes()
 
-    if df_user_attributes.empty:
+    if not attributes:
         print(f"Exit: Organization has no user attributes")
         exit(1)
 
-    print(f"Find attribute with name: {ATTRIBUTE_NAME}")
-    attribute = df_user_attributes[df_user_attributes['name'] == ATTRIBUTE_NAME].iloc[0]
-
-    new_user_attribute_values = {}
-    # Convert current user attribute values to dictionary
-    for index, i in enumerate(attribute["users"]):
-        new_user_attribute_values[i["userUuid"]] = {
-            "userUuid": i["userUuid"],
-            "value": i["value"],
-        }
-    # Update dictionary with new values
-    for idx, row in df_user_attributes_to_grant.iterrows():
-        email = row["email"]
-        value = row["value"]
-        print(f'Find user with email: {email}')
-        match_users = df_users[df_users['email'] == email]
-
-        if match_users.empty:
-            print(f'Skipping: User {email} does not exist in organization')
+    # Emails are matched case-insensitively through an email -> userUuid index, once for all attributes
+    plans, unknown = plan_attribute_updates(attributes, df_user_attributes_to_grant, users)
+    for name in unknown:
+        print(f'Skipping: Attribute {name} does not exist in organization')
+    unmatched_emails = {email for _, _, summary in plans for email in summary['unmatched_emails']}
+    for email in sorted(unmatched_emails):
+        print(f'Skipping: User {email} does not exist in organization')
+    for attribute, _, summary in plans:
+        print(
+            f"{attribute['name']}: {summary['rows']} rows, {summary['matched']} matched, "
+            f"{summary['unmatched']} unmatched, {summary['unchanged']} unchanged"
+        )
+        if summary['needs_update']:
+            print(f"  {summary['added']} new and {summary['updated']} changed value(s) to write")
         else:
-            print(f'Updating attribute {ATTRIBUTE_NAME} for {email} to {value}')
-            userUuid = match_users.iloc[0]["userUuid"]
-            new_user_attribute_values[userUuid] = {
-                "userUuid": userUuid,
-                "value": value,
-            }
-
-    new_user_attribute_values = {
-        "name": attribute["name"],
-        "users": list(new_user_attribute_values.values()),
-    }
+            print(f"  Values match the current ones, skipping update")
 
-    if "description" in attribute:
-        new_user_attribute_values["description"] = attribute["description"]
-
-    if "attributeDefault" in attribute:
-        new_user_attribute_values["attributeDefault"] = attribute["attributeDefault"]
-
-    target.update_user_attribute(
-        attribute["uuid"],
-        new_user_attribute_values,
-    )
-    print(f'Updated user attributes with success')
+    updated, errors = apply_attribute_updates(target, plans, max_workers=MAX_WORKERS)
+    for name, error in errors.items():
+        print(f'Failed to update attribute {name}: {error}')
+    print(f'Updated {len(updated)} user attribute(s) with success, {len(plans) - len(updated) - len(errors)} unchanged')
@@ -22,14 +22,27 @@ https://docs.lightdash.com/references/usage-analytics#query-tags
 
 import requests
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator
 import json
+from lightdash.pagination import paginate
+from lightdash.dashboard_stats import VIEW_BUCKETS, DashboardStats, cleanup_frame
+from lightdash.instrumentation import instrument_session
+from lightdash.records import Dashboard
+from lightdash.snapshot import ContentSnapshot
 
 # Configuration
 API_URL = 'https://{YOUR_INSTANCE_URL}.lightdash.cloud'  # Update with your instance URL
 API_KEY = ''  # Update with your API key
 PROJECT_UUID = ''  # REQUIRED: Update with your project UUID
 EXPORT_METHOD = 'csv'  # or 'csv' or 'json'
+# Optional SQLite snapshot, e.g. 'lightdash_dashboards.db'. With a snapshot, later runs only fetch
+# dashboards updated since the previous run. View counts of unchanged dashboards and deletions are
+# only refreshed by a full refresh, so schedule one regularly (e.g. daily for an hourly job).
+SNAPSHOT_PATH = None
+FULL_REFRESH = False
+PAGE_SIZE = 100
+# Pages requested concurrently once the first page reports the total. 0 fetches one page at a time.
+PAGE_PREFETCH = 8
 
 # you can run this script with: poetry run python find_dashboards.py
 
@@ -38,8 +51,12 @@ session.headers.update({
     'Authorization': f'ApiKey {API_KEY}',
     'Content-Type': 'application/json',
 })
+# Enough pooled connections for every prefetched page. Requests are reported to
+# lightdash.instrumentation hooks, e.g. with LIGHTDASH_REQUEST_STATS=1.
+instrument_session(session, pool_maxsize=max(PAGE_PREFETCH, 10))
 
-def fetch_content_page(page: int = 1, page_size: int = 100, project_uuids: List[str] = None) -> Dict[str, Any]:
+def fetch_content_page(page: int = 1, page_size: int = 100, project_uuids: List[str] = None,
+                       sort_by: str = 'name', sort_direction: str = 'asc') -> Dict[str, Any]:
     """Fetch a single page of dashboard content"""
     endpoint = f"{API_URL}/api/v2/content"
     
@@ -47,8 +64,8 @@ def fetch_content_page(page: int = 1, page_size: int = 100, project_uuids: List[
         'contentTypes': 'dashboard',  # Only fetch dashboards
         'page': page,
         'pageSize': page_size,
-        'sortBy': 'name',
-        'sortDirection': 'asc'
+        'sortBy': sort_by,
+        'sortDirection': sort_direction
     }
     
     # Add project filters if specified
@@ -59,107 +76,68 @@ def fetch_content_page(page: int = 1, page_size: int = 100, project_uuids: List[
     response.raise_for_status()
     return response.json()
 
+def iter_dashboards(project_uuids: List[str], page_size: int = None,
+                    prefetch: int = None) -> Iterator[Dict[str, Any]]:
+    """Lazily yield dashboards page by page, with up to `prefetch` pages requested concurrently.
+
+    Items come out in page order whatever order the pages arrive in.
+    """
+    def fetch_page(page: int, size: int) -> Dict[str, Any]:
+        print(f"📄 Fetching page {page}...", flush=True)
+        data = fetch_content_page(page, size, project_uuids)
+        if 'results' not in data or 'data' not in data['results']:
+            print("⚠️  Unexpected response structure")
+            return {}
+        return data['results']
+
+    return paginate(
+        fetch_page,
+        page_size=page_size or PAGE_SIZE,
+        prefetch=PAGE_PREFETCH if prefetch is None else prefetch,
+    )
+
 def fetch_all_dashboards(project_uuids: List[str]) -> List[Dict[str, Any]]:
     """Fetch all dashboards with pagination"""
-    all_dashboards = []
-    page = 1
-    page_size = 100
-    
-    while True:
-        print(f"📄 Fetching page {page}...", end=" ", flush=True)
-        data = fetch_content_page(page, page_size, project_uuids)
-        
-        # Extract dashboards from response
-        if 'results' in data and 'data' in data['results']:
-            dashboards = data['results']['data']
-            all_dashboards.extend(dashboards)
-            print(f"✓ ({len(dashboards)} dashboards)")
-            
-            # Check if there are more pages
-            pagination = data['results'].get('pagination', {})
-            total_pages = pagination.get('totalPages', 1)
-            
-            if page >= total_pages:
-                print(f"📝 Completed fetching {total_pages} page(s)")
-                break
-            page += 1
-        else:
-            print("⚠️  Unexpected response structure")
-            break
-    
+    all_dashboards = list(iter_dashboards(project_uuids))
+    print(f"📝 Completed fetching {len(all_dashboards)} dashboard(s)")
     return all_dashboards
 
-def parse_dashboards(dashboards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Parse dashboard data into a structured format"""
-    parsed_data = []
-    
-    for dashboard in dashboards:
-        # Extract nested data safely
-        project_info = dashboard.get('project', {})
-        organization_info = dashboard.get('organization', {})
-        space_info = dashboard.get('space', {})
-        created_by = dashboard.get('createdBy', {})
-        last_updated_by = dashboard.get('lastUpdatedBy', {})
-        
-        # Create full name for users
-        created_by_name = ''
-        if created_by:
-            first_name = created_by.get('firstName') or ''
-            last_name = created_by.get('lastName') or ''
-            created_by_name = f"{first_name} {last_name}".strip()
-        
-        updated_by_name = ''
-        if last_updated_by:
-            first_name = last_updated_by.get('firstName') or ''
-            last_name = last_updated_by.get('lastName') or ''
-            updated_by_name = f"{first_name} {last_name}".strip()
-        
-        parsed_data.append({
-            'uuid': dashboard.get('uuid', ''),
-            'name': dashboard.get('name', ''),
-            'slug': dashboard.get('slug', ''),
-            'description': dashboard.get('description', ''),
-            'content_type': dashboard.get('contentType', ''),
-            'created_at': dashboard.get('createdAt', ''),
-            'created_by': {
-                'uuid': created_by.get('uuid', '') if created_by else '',
-                'name': created_by_name,
-                'first_name': created_by.get('firstName', '') if created_by else '',
-                'last_name': created_by.get('lastName', '') if created_by else ''
-            },
-            'last_updated_at': dashboard.get('lastUpdatedAt', ''),
-            'last_updated_by': {
-                'uuid': last_updated_by.get('uuid', '') if last_updated_by else '',
-                'name': updated_by_name,
-                'first_name': last_updated_by.get('firstName', '') if last_updated_by else '',
-                'last_name': last_updated_by.get('lastName', '') if last_updated_by else ''
-            },
-            'project': {
-                'uuid': project_info.get('uuid', ''),
-                'name': project_info.get('name', '')
-            },
-            'organization': {
-                'uuid': organization_info.get('uuid', ''),
-                'name': organization_info.get('name', '')
-            },
-            'space': {
-                'uuid': space_info.get('uuid', ''),
-                'name': space_info.get('name', '')
-            },
-            'views': dashboard.get('views', 0),
-            'first_viewed_at': dashboard.get('firstViewedAt', ''),
-            'pinned_list_uuid': dashboard.get('pinnedList', {}).get('uuid', '') if dashboard.get('pinnedList') else None,
-            'is_pinned': dashboard.get('pinnedList') is not None,
-            'has_description': bool((dashboard.get('description') or '').strip()),
-            'url_slug': dashboard.get('slug', ''),
-            # Additional computed fields for analysis
-            'days_since_creation': None,  # Will be computed if needed
-            'days_since_last_update': None,  # Will be computed if needed
-        })
-    
-    return parsed_data
+def iter_updated_dashboards(project_uuids: List[str], since: str, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+    """Yield dashboards updated at or after `since`, newest first.
+
+    Pages are requested lazily and the listing stops at the first older dashboard, so an
+    unchanged project costs a single request.
+    """
+    def fetch_page(page: int, size: int) -> Dict[str, Any]:
+        print(f"📄 Fetching changes page {page}...", flush=True)
+        data = fetch_content_page(page, size, project_uuids, sort_by='last_updated_at', sort_direction='desc')
+        return data.get('results') or {}
+
+    for dashboard in paginate(fetch_page, page_size=page_size):
+        # Dashboards updated exactly at `since` are fetched again in case several share that time
+        if (dashboard.get('lastUpdatedAt') or '') < since:
+            return
+        yield dashboard
+
+def sync_dashboard_snapshot(snapshot: ContentSnapshot, project_uuids: List[str], full_refresh: bool = False) -> List[Dict[str, Any]]:
+    """Bring the snapshot up to date and return all of its dashboards, sorted by name"""
+    since = None if full_refresh else snapshot.last_updated_at(project_uuids, ['dashboard'])
+    if since is None:
+        print("🔄 Full refresh of the dashboard snapshot")
+        new, updated, deleted = snapshot.replace(fetch_all_dashboards(project_uuids), project_uuids, ['dashboard'])
+        print(f"💾 Snapshot: {new} new, {updated} refreshed, {deleted} deleted")
+    else:
+        print(f"🔄 Fetching dashboards updated since {since}")
+        new, updated = snapshot.merge(iter_updated_dashboards(project_uuids, since))
+        print(f"💾 Snapshot: {new} new, {updated} updated")
+    return sorted(snapshot.items(project_uuids, ['dashboard']), key=lambda d: d.get('name') or '')
 
-def export_dashboards(dashboards: List[Dict[str, Any]], export_method: str = 'excel'):
+def parse_dashboards(dashboards: Iterable[Dict[str, Any]]) -> List[Dashboard]:
+    """Parse dashboard data into compact Dashboard records"""
+    # One slotted object per dashboard instead of six nested dicts
+    return [Dashboard.from_api(dashboard) for dashboard in dashboards]
+
+def export_dashboards(dashboards: List[Dashboard], export_method: str = 'excel'):
     """Export dashboards to file"""
     if not dashboards:
         print("⚠️  No dashboards to export.")
@@ -171,30 +149,18 @@ def export_dashboards(dashboards: List[Dict[str, Any]], export_method: str = 'ex
         # Create comprehensive JSON structure with metadata
         from datetime import datetime
         
-        # Calculate summary statistics
-        total_dashboards = len(dashboards)
-        unique_projects = len(set(d['project']['uuid'] for d in dashboards if d['project']['uuid']))
-        unique_spaces = len(set(d['space']['uuid'] for d in dashboards if d['space']['uuid']))
-        unique_organizations = len(set(d['organization']['uuid'] for d in dashboards if d['organization']['uuid']))
-        total_views = sum(d.get('views', 0) for d in dashboards)
-        dashboards_with_descriptions = sum(1 for d in dashboards if d.get('has_description'))
-        pinned_dashboards = sum(1 for d in dashboards if d.get('is_pinned'))
-        
-        # Group by project for easy analysis
+        # Calculate summary statistics and group by project in a single pass
+        stats = DashboardStats()
         dashboards_by_project = {}
         dashboards_by_space = {}
+        dashboard_dicts = []
         
         for dashboard in dashboards:
-            project_name = dashboard['project']['name']
-            space_name = dashboard['space']['name']
-            
-            if project_name not in dashboards_by_project:
-                dashboards_by_project[project_name] = []
-            dashboards_by_project[project_name].append(dashboard)
-            
-            if space_name not in dashboards_by_space:
-                dashboards_by_space[space_name] = []
-            dashboards_by_space[space_name].append(dashboard)
+            stats.add(dashboard)
+            dashboard_dict = dashboard.to_dict()
+            dashboard_dicts.append(dashboard_dict)
+            dashboards_by_project.setdefault(dashboard.project_name, []).append(dashboard_dict)
+            dashboards_by_space.setdefault(dashboard.space_name, []).append(dashboard_dict)
         
         # Create structured output
         export_data = {
@@ -202,26 +168,25 @@ def export_dashboards(dashboards: List[Dict[str, Any]], export_method: str = 'ex
                 'export_timestamp': datetime.now().isoformat(),
                 'api_url': API_URL,
                 'project_uuid': PROJECT_UUID,
-                'project_name': dashboards[0]['project']['name'] if dashboards else 'Unknown',
-                'total_dashboards': total_dashboards,
-                'unique_projects': unique_projects,
-                'unique_spaces': unique_spaces,
-                'unique_organizations': unique_organizations,
-                'total_views': total_views,
-                'dashboards_with_descriptions': dashboards_with_descriptions,
-                'pinned_dashboards': pinned_dashboards,
+                'project_name': dashboards[0].project_name if dashboards else 'Unknown',
+                'total_dashboards': stats.total,
+                'unique_projects': len(stats.project_uuids),
+                'unique_spaces': len(stats.space_uuids),
+                'unique_organizations': len(stats.organization_uuids),
+                'total_views': stats.total_views,
+                'dashboards_with_descriptions': stats.with_description,
+                'pinned_dashboards': stats.pinned,
                 'export_method': export_method
             },
             'summary_stats': {
-                'projects': {name: len(dashes) for name, dashes in dashboards_by_project.items()},
-                'spaces': {name: len(dashes) for name, dashes in dashboards_by_space.items()},
-                'top_viewed_dashboards': sorted(
-                    [{'name': d['name'], 'views': d['views'], 'project': d['project']['name']} 
-                     for d in dashboards], 
-                    key=lambda x: x['views'], reverse=True
-                )[:10]
+                'projects': {name: tally[0] for name, tally in stats.by_project.items()},
+                'spaces': {name: tally[0] for name, tally in stats.by_space.items()},
+                'top_viewed_dashboards': [
+                    {'name': d.name, 'views': d.views, 'project': d.project_name}
+                    for d in stats.top_viewed.items()
+                ]
             },
-            'dashboards': dashboards,
+            'dashboards': dashboard_dicts,
             'dashboards_by_project': dashboards_by_project,
             'dashboards_by_space': dashboards_by_space
         }
@@ -229,35 +194,35 @@ def export_dashboards(dashboards: List[Dict[str, Any]], export_method: str = 'ex
         with open(filename, 'w') as f:
             json.dump(export_data, f, indent=2, default=str, ensure_ascii=False)
         print(f"✅ Enhanced JSON export successful: {filename}")
-        print(f"   📊 Exported {total_dashboards} dashboards with metadata and groupings")
+        print(f"   📊 Exported {stats.total} dashboards with metadata and groupings")
     else:
         # Create flattened DataFrame for Excel/CSV export
         flattened_data = []
         for dashboard in dashboards:
             flattened_data.append({
-                'UUID': dashboard.get('uuid', ''),
-                'Name': dashboard.get('name', ''),
-                'Slug': dashboard.get('slug', ''),
-                'Description': dashboard.get('description') or '',
-                'Content Type': dashboard.get('content_type', ''),
-                'Created At': dashboard.get('created_at', ''),
-                'Created By Name': dashboard.get('created_by', {}).get('name', ''),
-                'Created By UUID': dashboard.get('created_by', {}).get('uuid', ''),
-                'Last Updated At': dashboard.get('last_updated_at', ''),
-                'Last Updated By Name': dashboard.get('last_updated_by', {}).get('name', ''),
-                'Last Updated By UUID': dashboard.get('last_updated_by', {}).get('uuid', ''),
-                'Project UUID': dashboard.get('project', {}).get('uuid', ''),
-                'Project Name': dashboard.get('project', {}).get('name', ''),
-                'Organization UUID': dashboard.get('organization', {}).get('uuid', ''),
-                'Organization Name': dashboard.get('organization', {}).get('name', ''),
-                'Space UUID': dashboard.get('space', {}).get('uuid', ''),
-                'Space Name': dashboard.get('space', {}).get('name', ''),
-                'Views': dashboard.get('views', 0),
-                'First Viewed At': dashboard.get('first_viewed_at', ''),
-                'Pinned List UUID': dashboard.get('pinned_list_uuid', ''),
-                'Is Pinned': dashboard.get('is_pinned', False),
-                'Has Description': dashboard.get('has_description', False),
-                'URL Slug': dashboard.get('url_slug', '')
+                'UUID': dashboard.uuid,
+                'Name': dashboard.name,
+                'Slug': dashboard.slug,
+                'Description': dashboard.description or '',
+                'Content Type': dashboard.content_type,
+                'Created At': dashboard.created_at,
+                'Created By Name': dashboard.created_by_name,
+                'Created By UUID': dashboard.created_by_uuid,
+                'Last Updated At': dashboard.last_updated_at,
+                'Last Updated By Name': dashboard.last_updated_by_name,
+                'Last Updated By UUID': dashboard.last_updated_by_uuid,
+                'Project UUID': dashboard.project_uuid,
+                'Project Name': dashboard.project_name,
+                'Organization UUID': dashboard.organization_uuid,
+                'Organization Name': dashboard.organization_name,
+                'Space UUID': dashboard.space_uuid,
+                'Space Name': dashboard.space_name,
+                'Views': dashboard.views,
+                'First Viewed At': dashboard.first_viewed_at,
+                'Pinned List UUID': dashboard.pinned_list_uuid,
+                'Is Pinned': dashboard.is_pinned,
+                'Has Description': dashboard.has_description,
+                'URL Slug': dashboard.slug
             })
         
         df = pd.DataFrame(flattened_data)
@@ -322,8 +287,11 @@ def export_dashboards(dashboards: List[Dict[str, Any]], export_method: str = 'ex
                 creator_summary = creator_summary.reset_index().sort_values('Dashboards Created', ascending=False)
                 creator_summary.to_excel(writer, sheet_name='Top Creators', index=False)
                 
+                # Cleanup candidates, with staleness and priority computed column-wise
+                cleanup_frame(df).to_excel(writer, sheet_name='Cleanup', index=False)
+                
             print(f"✅ Enhanced Excel export successful: {filename}")
-            print(f"   📊 Created sheets: Dashboards, Summary, By Project, By Space, Top Creators")
+            print(f"   📊 Created sheets: Dashboards, Summary, By Project, By Space, Top Creators, Cleanup")
             
         elif export_method == 'csv':
             filename = 'lightdash_dashboards.csv'
@@ -332,55 +300,8 @@ def export_dashboards(dashboards: List[Dict[str, Any]], export_method: str = 'ex
             
             # Also create a dashboard cleanup-focused CSV
             cleanup_filename = 'lightdash_dashboards_cleanup.csv'
-            cleanup_data = []
-            for dashboard in dashboards:
-                # Calculate days since creation and last update
-                from datetime import datetime
-                try:
-                    created_date = datetime.fromisoformat(dashboard.get('created_at', '').replace('Z', '+00:00'))
-                    days_since_creation = (datetime.now(created_date.tzinfo) - created_date).days
-                except:
-                    days_since_creation = None
-                
-                try:
-                    updated_date = datetime.fromisoformat(dashboard.get('last_updated_at', '').replace('Z', '+00:00'))
-                    days_since_update = (datetime.now(updated_date.tzinfo) - updated_date).days
-                except:
-                    days_since_update = None
-                
-                # Cleanup recommendation
-                views = dashboard.get('views', 0)
-                cleanup_recommendation = ""
-                if views == 0:
-                    cleanup_recommendation = "NEVER_VIEWED - Consider archiving"
-                elif views <= 5:
-                    cleanup_recommendation = "LOW_ENGAGEMENT - Review usage"
-                elif days_since_update and days_since_update > 180:
-                    cleanup_recommendation = "STALE - Not updated in 6+ months"
-                elif not dashboard.get('has_description'):
-                    cleanup_recommendation = "NO_DESCRIPTION - Add description"
-                else:
-                    cleanup_recommendation = "ACTIVE - Keep"
-                
-                cleanup_data.append({
-                    'Dashboard_Name': dashboard.get('name', ''),
-                    'Dashboard_UUID': dashboard.get('uuid', ''),
-                    'Project_Name': dashboard.get('project', {}).get('name', ''),
-                    'Space_Name': dashboard.get('space', {}).get('name', ''),
-                    'Total_Views': views,
-                    'Created_Date': dashboard.get('created_at', '')[:10],
-                    'Last_Updated_Date': dashboard.get('last_updated_at', '')[:10],
-                    'Days_Since_Creation': days_since_creation,
-                    'Days_Since_Update': days_since_update,
-                    'Has_Description': dashboard.get('has_description', False),
-                    'Is_Pinned': dashboard.get('is_pinned', False),
-                    'First_Viewed_Date': dashboard.get('first_viewed_at', '')[:10] if dashboard.get('first_viewed_at') else '',
-                    'Cleanup_Recommendation': cleanup_recommendation,
-                    'Dashboard_URL_Slug': dashboard.get('slug', '')
-                })
-            
-            cleanup_df = pd.DataFrame(cleanup_data)
-            cleanup_df = cleanup_df.sort_values(['Total_Views', 'Days_Since_Update'], ascending=[True, False])
+            # Dates are parsed once into datetime64 columns and the cleanup fields are column operations
+            cleanup_df = cleanup_frame(df)
             cleanup_df.to_csv(cleanup_filename, index=False)
             print(f"✅ Dashboard cleanup CSV created: {cleanup_filename}")
             print(f"   🧹 Sorted by views (lowest first) and staleness for easy cleanup decisions")
@@ -389,9 +310,15 @@ def export_dashboards(dashboards: List[Dict[str, Any]], export_method: str = 'ex
     
     return filename
 
-def print_dashboard_summary(dashboards: List[Dict[str, Any]]):
+def print_dashboard_summary(dashboards: Iterable[Dashboard]):
     """Print a comprehensive summary of dashboard data to console"""
-    if not dashboards:
+    from datetime import datetime, timedelta
+    
+    # All statistics are gathered in one pass; lists keep only the 10 dashboards shown
+    cutoff_date = (datetime.now() - timedelta(days=180)).isoformat()  # 6 months ago
+    stats = DashboardStats(stale_before=cutoff_date).update(dashboards)
+    total_dashboards = stats.total
+    if not total_dashboards:
         print("⚠️  No dashboards to analyze.")
         return
     
@@ -400,45 +327,31 @@ def print_dashboard_summary(dashboards: List[Dict[str, Any]]):
     print("="*80)
     
     # Basic statistics
-    total_dashboards = len(dashboards)
-    unique_projects = len(set(d['project']['uuid'] for d in dashboards if d['project']['uuid']))
-    unique_spaces = len(set(d['space']['uuid'] for d in dashboards if d['space']['uuid']))
-    unique_organizations = len(set(d['organization']['uuid'] for d in dashboards if d['organization']['uuid']))
-    total_views = sum(d.get('views', 0) for d in dashboards)
-    dashboards_with_descriptions = sum(1 for d in dashboards if d.get('has_description'))
-    pinned_dashboards = sum(1 for d in dashboards if d.get('is_pinned'))
+    dashboards_with_descriptions = stats.with_description
+    pinned_dashboards = stats.pinned
     
     print(f"\n📈 OVERVIEW:")
     print(f"   Total Dashboards: {total_dashboards:,}")
-    print(f"   Unique Organizations: {unique_organizations}")
-    print(f"   Unique Projects: {unique_projects}")
-    print(f"   Unique Spaces: {unique_spaces}")
-    print(f"   Total Views: {total_views:,}")
+    print(f"   Unique Organizations: {len(stats.organization_uuids)}")
+    print(f"   Unique Projects: {len(stats.project_uuids)}")
+    print(f"   Unique Spaces: {len(stats.space_uuids)}")
+    print(f"   Total Views: {stats.total_views:,}")
     print(f"   Dashboards with Descriptions: {dashboards_with_descriptions} ({dashboards_with_descriptions/total_dashboards*100:.1f}%)")
     print(f"   Pinned Dashboards: {pinned_dashboards} ({pinned_dashboards/total_dashboards*100:.1f}%)")
     
     # Top viewed dashboards
     print(f"\n🔥 TOP 10 MOST VIEWED DASHBOARDS:")
-    top_viewed = sorted(dashboards, key=lambda x: x.get('views', 0), reverse=True)[:10]
-    for i, dashboard in enumerate(top_viewed, 1):
-        views = dashboard.get('views', 0)
-        name = dashboard.get('name', 'Unnamed')[:40]
-        uuid = dashboard.get('uuid', '')[:8]
-        space = dashboard.get('space', {}).get('name', 'Unknown')[:20]
+    for i, dashboard in enumerate(stats.top_viewed.items(), 1):
+        views = dashboard.views
+        name = dashboard.name[:40]
+        uuid = dashboard.uuid[:8]
+        space = dashboard.space_name[:20]
         print(f"   {i:2d}. {name:<42} | {uuid} | {views:>6,} views | {space}")
     
     # Projects breakdown
     print(f"\n🏗️  DASHBOARDS BY PROJECT:")
-    project_counts = {}
-    project_views = {}
-    for dashboard in dashboards:
-        project_name = dashboard.get('project', {}).get('name', 'Unknown')
-        project_counts[project_name] = project_counts.get(project_name, 0) + 1
-        project_views[project_name] = project_views.get(project_name, 0) + dashboard.get('views', 0)
-    
-    sorted_projects = sorted(project_counts.items(), key=lambda x: x[1], reverse=True)
-    for project_name, count in sorted_projects[:10]:  # Show top 10 projects
-        views = project_views[project_name]
+    sorted_projects = stats.ranked(stats.by_project)
+    for project_name, count, views, _ in sorted_projects[:10]:  # Show top 10 projects
         avg_views = views / count if count > 0 else 0
         print(f"   {project_name:<40} | {count:>3} dashboards | {views:>8,} total views | {avg_views:>6.1f} avg")
     
@@ -447,16 +360,8 @@ def print_dashboard_summary(dashboards: List[Dict[str, Any]]):
     
     # Spaces breakdown
     print(f"\n🏠 DASHBOARDS BY SPACE:")
-    space_counts = {}
-    space_views = {}
-    for dashboard in dashboards:
-        space_name = dashboard.get('space', {}).get('name', 'Unknown')
-        space_counts[space_name] = space_counts.get(space_name, 0) + 1
-        space_views[space_name] = space_views.get(space_name, 0) + dashboard.get('views', 0)
-    
-    sorted_spaces = sorted(space_counts.items(), key=lambda x: x[1], reverse=True)
-    for space_name, count in sorted_spaces[:10]:  # Show top 10 spaces
-        views = space_views[space_name]
+    sorted_spaces = stats.ranked(stats.by_space)
+    for space_name, count, views, _ in sorted_spaces[:10]:  # Show top 10 spaces
         avg_views = views / count if count > 0 else 0
         print(f"   {space_name:<40} | {count:>3} dashboards | {views:>8,} total views | {avg_views:>6.1f} avg")
     
@@ -467,45 +372,24 @@ def print_dashboard_summary(dashboards: List[Dict[str, Any]]):
     print(f"\n🎯 ACTIVITY INSIGHTS:")
     
     # Most active creators
-    creator_counts = {}
-    for dashboard in dashboards:
-        creator_name = (dashboard.get('created_by', {}).get('name') or 'Unknown').strip()
-        if creator_name and creator_name != 'Unknown':
-            creator_counts[creator_name] = creator_counts.get(creator_name, 0) + 1
-    
-    if creator_counts:
+    if stats.by_creator:
         print(f"   Top Dashboard Creators:")
-        sorted_creators = sorted(creator_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-        for creator, count in sorted_creators:
+        for creator, count, _ in stats.ranked(stats.by_creator)[:5]:
             print(f"   - {creator:<30} | {count:>3} dashboards")
     
     # Recently updated dashboards
     print(f"\n🕒 RECENTLY UPDATED DASHBOARDS:")
-    recent_dashboards = [d for d in dashboards if d.get('last_updated_at')]
-    recent_dashboards.sort(key=lambda x: x.get('last_updated_at', ''), reverse=True)
-    
-    for dashboard in recent_dashboards[:10]:
-        name = dashboard.get('name', 'Unnamed')[:40]
-        uuid = dashboard.get('uuid', '')[:8]
-        updated_at = dashboard.get('last_updated_at', '')[:10]  # Just the date
-        updated_by = (dashboard.get('last_updated_by', {}).get('name') or 'Unknown')[:15]
-        views = dashboard.get('views', 0)
+    for dashboard in stats.recently_updated.items():
+        name = dashboard.name[:40]
+        uuid = dashboard.uuid[:8]
+        updated_at = (dashboard.last_updated_at or '')[:10]  # Just the date
+        updated_by = (dashboard.last_updated_by_name or 'Unknown')[:15]
+        views = dashboard.views
         print(f"   - {name:<42} | {uuid} | {updated_at} | by {updated_by:<17} | {views:>4} views")
     
     # Views distribution
     print(f"\n📊 VIEWS DISTRIBUTION:")
-    view_ranges = [
-        (0, 0, "No views"),
-        (1, 10, "1-10 views"),
-        (11, 50, "11-50 views"),
-        (51, 100, "51-100 views"),
-        (101, 500, "101-500 views"),
-        (501, 1000, "501-1000 views"),
-        (1001, float('inf'), "1000+ views")
-    ]
-    
-    for min_views, max_views, label in view_ranges:
-        count = sum(1 for d in dashboards if min_views <= d.get('views', 0) <= max_views)
+    for (_, _, label), count in zip(VIEW_BUCKETS, stats.view_histogram):
         percentage = count / total_dashboards * 100 if total_dashboards > 0 else 0
         bar = "█" * int(percentage / 5)  # Simple bar chart
         print(f"   {label:<15} | {count:>4} dashboards ({percentage:>5.1f}%) {bar}")
@@ -514,83 +398,74 @@ def print_dashboard_summary(dashboards: List[Dict[str, Any]]):
     print(f"\n🧹 DASHBOARD CLEANUP RECOMMENDATIONS:")
     
     # Dashboards with zero views
-    zero_views = [d for d in dashboards if d.get('views', 0) == 0]
+    zero_views = stats.zero_views
     if zero_views:
-        print(f"   📱 {len(zero_views)} dashboards have NEVER been viewed:")
-        for dashboard in sorted(zero_views, key=lambda x: x.get('created_at', ''))[:10]:
-            name = dashboard.get('name', 'Unnamed')[:40]
-            uuid = dashboard.get('uuid', '')[:8]
-            created_at = dashboard.get('created_at', '')[:10]
-            space = dashboard.get('space', {}).get('name', 'Unknown')[:20]
+        print(f"   📱 {zero_views} dashboards have NEVER been viewed:")
+        for dashboard in stats.oldest_zero_views.items():
+            name = dashboard.name[:40]
+            uuid = dashboard.uuid[:8]
+            created_at = (dashboard.created_at or '')[:10]
+            space = dashboard.space_name[:20]
             print(f"   - {name:<42} | {uuid} | Created: {created_at} | {space}")
-        if len(zero_views) > 10:
-            print(f"   ... and {len(zero_views) - 10} more dashboards with zero views")
+        if zero_views > 10:
+            print(f"   ... and {zero_views - 10} more dashboards with zero views")
     
     # Low-engagement dashboards (1-5 views)
-    low_engagement = [d for d in dashboards if 1 <= d.get('views', 0) <= 5]
+    low_engagement = stats.low_engagement
     if low_engagement:
-        print(f"   🔹 {len(low_engagement)} dashboards have very low engagement (1-5 views):")
-        for dashboard in sorted(low_engagement, key=lambda x: x.get('views', 0))[:10]:
-            name = dashboard.get('name', 'Unnamed')[:40]
-            uuid = dashboard.get('uuid', '')[:8]
-            views = dashboard.get('views', 0)
-            space = dashboard.get('space', {}).get('name', 'Unknown')[:20]
+        print(f"   🔹 {low_engagement} dashboards have very low engagement (1-5 views):")
+        for dashboard in stats.least_viewed_low_engagement.items():
+            name = dashboard.name[:40]
+            uuid = dashboard.uuid[:8]
+            views = dashboard.views
+            space = dashboard.space_name[:20]
             print(f"   - {name:<42} | {uuid} | {views} views | {space}")
-        if len(low_engagement) > 10:
-            print(f"   ... and {len(low_engagement) - 10} more low-engagement dashboards")
+        if low_engagement > 10:
+            print(f"   ... and {low_engagement - 10} more low-engagement dashboards")
     
     # Old dashboards without recent updates
-    from datetime import datetime, timedelta
-    
-    # Parse dates and find old dashboards
-    cutoff_date = (datetime.now() - timedelta(days=180)).isoformat()  # 6 months ago
-    old_dashboards = []
-    
-    for dashboard in dashboards:
-        last_updated = dashboard.get('last_updated_at', '')
-        if last_updated and last_updated < cutoff_date:
-            old_dashboards.append(dashboard)
-    
+    old_dashboards = stats.stale
     if old_dashboards:
-        print(f"   📅 {len(old_dashboards)} dashboards haven't been updated in 6+ months:")
-        for dashboard in sorted(old_dashboards, key=lambda x: x.get('last_updated_at', ''))[:10]:
-            name = dashboard.get('name', 'Unnamed')[:40]
-            uuid = dashboard.get('uuid', '')[:8]
-            updated_at = dashboard.get('last_updated_at', '')[:10]
-            views = dashboard.get('views', 0)
+        print(f"   📅 {old_dashboards} dashboards haven't been updated in 6+ months:")
+        for dashboard in stats.least_recently_updated.items():
+            name = dashboard.name[:40]
+            uuid = dashboard.uuid[:8]
+            updated_at = (dashboard.last_updated_at or '')[:10]
+            views = dashboard.views
             print(f"   - {name:<42} | {uuid} | Updated: {updated_at} | {views} views")
-        if len(old_dashboards) > 10:
-            print(f"   ... and {len(old_dashboards) - 10} more stale dashboards")
+        if old_dashboards > 10:
+            print(f"   ... and {old_dashboards - 10} more stale dashboards")
     
     # Dashboards without descriptions
-    no_description = [d for d in dashboards if not d.get('has_description')]
+    no_description = stats.no_description
     if no_description:
-        print(f"   📝 {len(no_description)} dashboards lack descriptions:")
-        for dashboard in sorted(no_description, key=lambda x: x.get('views', 0), reverse=True)[:10]:
-            name = dashboard.get('name', 'Unnamed')[:40]
-            uuid = dashboard.get('uuid', '')[:8]
-            views = dashboard.get('views', 0)
-            space = dashboard.get('space', {}).get('name', 'Unknown')[:20]
+        print(f"   📝 {no_description} dashboards lack descriptions:")
+        for dashboard in stats.most_viewed_no_description.items():
+            name = dashboard.name[:40]
+            uuid = dashboard.uuid[:8]
+            views = dashboard.views
+            space = dashboard.space_name[:20]
             print(f"   - {name:<42} | {uuid} | {views} views | {space}")
-        if len(no_description) > 10:
-            print(f"   ... and {len(no_description) - 10} more dashboards without descriptions")
+        if no_description > 10:
+            print(f"   ... and {no_description - 10} more dashboards without descriptions")
     
     print(f"\n💡 CLEANUP SUGGESTIONS:")
     if zero_views:
-        print(f"   • Consider archiving/deleting {len(zero_views)} dashboards with zero views")
+        print(f"   • Consider archiving/deleting {zero_views} dashboards with zero views")
     if low_engagement:
-        print(f"   • Review {len(low_engagement)} dashboards with minimal engagement")
+        print(f"   • Review {low_engagement} dashboards with minimal engagement")
     if old_dashboards:
-        print(f"   • Audit {len(old_dashboards)} dashboards not updated recently")
+        print(f"   • Audit {old_dashboards} dashboards not updated recently")
     if no_description:
-        print(f"   • Add descriptions to {len(no_description)} dashboards for better discovery")
+        print(f"   • Add descriptions to {no_description} dashboards for better discovery")
     
+    example_uuid = stats.first.uuid
     print(f"\n💡 HOW TO USE DASHBOARD UUIDs:")
     print(f"   Dashboard URLs follow this pattern:")
     print(f"   {API_URL}/projects/{PROJECT_UUID}/dashboards/{{DASHBOARD_UUID}}/view")
     print(f"   ")
-    print(f"   Example: To view dashboard {dashboards[0].get('uuid', '')[:8]}... visit:")
-    print(f"   {API_URL}/projects/{PROJECT_UUID}/dashboards/{dashboards[0].get('uuid', '')}/view")
+    print(f"   Example: To view dashboard {example_uuid[:8]}... visit:")
+    print(f"   {API_URL}/projects/{PROJECT_UUID}/dashboards/{example_uuid}/view")
     
     print(f"\n⚠️  IMPORTANT NOTE:")
     print(f"   This analysis is based on total view counts and creation/modification dates.")
@@ -627,7 +502,11 @@ def main():
         project_uuids = [PROJECT_UUID]
         
         # Fetch all dashboards for the specified project
-        raw_dashboards = fetch_all_dashboards(project_uuids)
+        if SNAPSHOT_PATH:
+            with ContentSnapshot(SNAPSHOT_PATH) as snapshot:
+                raw_dashboards = sync_dashboard_snapshot(snapshot, project_uuids, FULL_REFRESH)
+        else:
+            raw_dashboards = fetch_all_dashboards(project_uuids)
         
         if not raw_dashboards:
             print("⚠️  No dashboards found.")
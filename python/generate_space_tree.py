@@ -1,9 +1,17 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
 from lightdash.api_client import LightdashApiClient
 
 # Lightdash configuration
 TARGET_URL = 'https://{YOUR_INSTANCE_URL}.lightdash.cloud/api/v1/'
 TARGET_API_KEY = ''
 TARGET_PROJECT_ID = ''
+# 'level' creates all spaces at the same depth concurrently, 'recursive' creates one at a time,
+# 'reconcile' only creates missing spaces and fixes privacy of existing ones, so it is safe to re-run
+CREATION_MODE = 'level'
+MAX_WORKERS = 8
+# Optional JSON or YAML file with the hierarchy, in the same format as SPACE_HIERARCHY below
+SPACE_HIERARCHY_FILE = None
 # Define the space hierarchy to be created
 SPACE_HIERARCHY = [
     {
@@ -73,24 +81,13 @@ SPACE_HIERARCHY = [
     }
 ]
 
-def create_space_tree(client, space_config, parent_path="", parent_uuid=None, created_spaces=None):
+def create_space(client, space_config, parent_path="", parent_uuid=None):
     """
-    Recursively create spaces according to the hierarchy defined in space_config
-    
-    Args:
-        client: LightdashApiClient instance
-        space_config: Dictionary defining the space and its children
-        parent_path: String representing the path to the parent (for logging)
-        parent_uuid: UUID of the parent space
-        created_spaces: List to track created spaces
+    Create a single space from its config
     
     Returns:
-        Dictionary containing the created space information
+        Dictionary describing the created space, or None if creation failed
     """
-    if created_spaces is None:
-        created_spaces = []
-    
-    # Create current space
     space_data = {
         'name': space_config['name'],
         'isPrivate': space_config.get('isPrivate', False)
@@ -105,25 +102,189 @@ def create_space_tree(client, space_config, parent_path="", parent_uuid=None, cr
     
     try:
         created_space = client.create_empty_space(space_data)
-        created_spaces.append({
-            'path': current_path,
-            'name': space_config['name'],
-            'uuid': created_space['uuid'],
-            'isPrivate': space_config.get('isPrivate', False),
-            'parentSpaceUuid': parent_uuid
-        })
-        print(f"✓ Successfully created space: {current_path} (UUID: {created_space['uuid']})")
-        
-        # Create child spaces with this space as their parent
-        for child in space_config.get('children', []):
-            create_space_tree(client, child, current_path, created_space['uuid'], created_spaces)
-            
-        return created_space
-        
     except Exception as e:
         print(f"✗ Failed to create space: {current_path}")
         print(f"  Error: {str(e)}")
         return None
+    
+    print(f"✓ Successfully created space: {current_path} (UUID: {created_space['uuid']})")
+    return {
+        'path': current_path,
+        'name': space_config['name'],
+        'uuid': created_space['uuid'],
+        'isPrivate': space_config.get('isPrivate', False),
+        'parentSpaceUuid': parent_uuid
+    }
+
+def create_space_tree(client, space_config, parent_path="", parent_uuid=None, created_spaces=None):
+    """
+    Recursively create spaces according to the hierarchy defined in space_config
+    
+    Args:
+        client: LightdashApiClient instance
+        space_config: Dictionary defining the space and its children
+        parent_path: String representing the path to the parent (for logging)
+        parent_uuid: UUID of the parent space
+        created_spaces: List to track created spaces
+    
+    Returns:
+        Dictionary containing the created space information
+    """
+    if created_spaces is None:
+        created_spaces = []
+    
+    created_space = create_space(client, space_config, parent_path, parent_uuid)
+    if created_space is None:
+        return None
+    created_spaces.append(created_space)
+    
+    # Create child spaces with this space as their parent
+    for child in space_config.get('children', []):
+        create_space_tree(client, child, created_space['path'], created_space['uuid'], created_spaces)
+    
+    return created_space
+
+def create_space_tree_by_level(client, space_configs, max_workers=8, created_spaces=None):
+    """
+    Create the hierarchy breadth-first, one depth level at a time
+    
+    All spaces at depth d are created concurrently (up to max_workers at once) as soon
+    as every space at depth d-1 exists, so wall time grows with the depth of the tree
+    rather than its number of spaces. Children of a space that failed are skipped.
+    
+    Args:
+        client: LightdashApiClient instance
+        space_configs: List of root space configs
+        max_workers: Maximum number of spaces created concurrently
+        created_spaces: List to track created spaces
+    
+    Returns:
+        List of created space information
+    """
+    if created_spaces is None:
+        created_spaces = []
+    
+    level = [(space_config, "", None) for space_config in space_configs]
+    depth = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while level:
+            print(f"Creating {len(level)} space(s) at depth {depth}")
+            results = list(executor.map(lambda item: create_space(client, *item), level))
+            next_level = []
+            for (space_config, _, _), created_space in zip(level, results):
+                if created_space is None:
+                    continue
+                created_spaces.append(created_space)
+                for child in space_config.get('children', []):
+                    next_level.append((child, created_space['path'], created_space['uuid']))
+            level = next_level
+            depth += 1
+    
+    return created_spaces
+
+def plan_space_tree(existing_spaces, space_configs):
+    """
+    Compute the minimal list of changes that make the project match the hierarchy
+    
+    Existing spaces are matched by (parentSpaceUuid, name). Missing spaces become
+    'create' steps and existing spaces with a different isPrivate become 'update' steps.
+    Descendants of a missing space are always created.
+    
+    Returns:
+        List of plan steps ordered by depth
+    """
+    index = {}
+    for space in existing_spaces:
+        index.setdefault((space.get('parentSpaceUuid'), space['name']), space)
+    
+    plan = []
+    level = [(space_config, "", None, True) for space_config in space_configs]
+    depth = 0
+    while level:
+        next_level = []
+        for space_config, parent_path, parent_uuid, parent_exists in level:
+            path = f"{parent_path}/{space_config['name']}" if parent_path else space_config['name']
+            is_private = space_config.get('isPrivate', False)
+            existing = index.get((parent_uuid, space_config['name'])) if parent_exists else None
+            if existing is None:
+                plan.append({'action': 'create', 'depth': depth, 'path': path, 'parentPath': parent_path,
+                             'parentUuid': parent_uuid, 'config': space_config})
+            elif existing.get('isPrivate', False) != is_private:
+                plan.append({'action': 'update', 'depth': depth, 'path': path, 'uuid': existing['uuid'],
+                             'config': space_config})
+            uuid = existing['uuid'] if existing is not None else None
+            for child in space_config.get('children', []):
+                next_level.append((child, path, uuid, existing is not None))
+        level = next_level
+        depth += 1
+    return plan
+
+def reconcile_space_tree(client, space_configs, max_workers=8, created_spaces=None):
+    """
+    Fetch existing spaces once and apply only the changes needed to match the hierarchy
+    
+    Creates run level by level as in create_space_tree_by_level, updates run concurrently.
+    A project that already matches costs one read and no writes.
+    
+    Returns:
+        List of created space information
+    """
+    if created_spaces is None:
+        created_spaces = []
+    
+    plan = plan_space_tree(client.spaces(), space_configs)
+    creates = [step for step in plan if step['action'] == 'create']
+    updates = [step for step in plan if step['action'] == 'update']
+    print(f"Plan: {len(creates)} space(s) to create, {len(updates)} space(s) to update")
+    if not plan:
+        return created_spaces
+    
+    # Uuids of spaces created by this run, so their children can be created on the next level
+    path_uuids = {}
+    
+    def update(step):
+        print(f"Updating privacy of space: {step['path']}")
+        try:
+            client.update_space(step['uuid'], {
+                'name': step['config']['name'],
+                'isPrivate': step['config'].get('isPrivate', False),
+            })
+        except Exception as e:
+            print(f"✗ Failed to update space: {step['path']}")
+            print(f"  Error: {str(e)}")
+    
+    def create(step):
+        parent_uuid = step['parentUuid'] or path_uuids.get(step['parentPath'])
+        if step['parentPath'] and parent_uuid is None:
+            print(f"✗ Skipping space {step['path']}: parent was not created")
+            return None
+        return create_space(client, step['config'], step['parentPath'], parent_uuid)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(update, updates))
+        for depth in sorted({step['depth'] for step in creates}):
+            level = [step for step in creates if step['depth'] == depth]
+            for created_space in executor.map(create, level):
+                if created_space is not None:
+                    path_uuids[created_space['path']] = created_space['uuid']
+                    created_spaces.append(created_space)
+    
+    return created_spaces
+
+def load_space_hierarchy(path):
+    """
+    Load a space hierarchy from a JSON or YAML file (YAML requires PyYAML)
+    """
+    with open(path) as f:
+        if path.endswith(('.yml', '.yaml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("Loading a YAML hierarchy requires PyYAML: pip install pyyaml")
+            hierarchy = yaml.safe_load(f)
+        else:
+            hierarchy = json.load(f)
+    return [hierarchy] if isinstance(hierarchy, dict) else hierarchy
 
 def print_space_tree(space_configs, indent=0):
     """
@@ -145,17 +306,24 @@ if __name__ == '__main__':
         print("Please set TARGET_API_KEY and TARGET_PROJECT_ID before running this script")
         exit(1)
     
+    space_hierarchy = load_space_hierarchy(SPACE_HIERARCHY_FILE) if SPACE_HIERARCHY_FILE else SPACE_HIERARCHY
+    
     print("Space hierarchy to be created:")
     print("=" * 50)
-    print_space_tree(SPACE_HIERARCHY)
+    print_space_tree(space_hierarchy)
     print("=" * 50)
     
-    client = LightdashApiClient(TARGET_URL, TARGET_API_KEY, TARGET_PROJECT_ID)
+    client = LightdashApiClient(TARGET_URL, TARGET_API_KEY, TARGET_PROJECT_ID, pool_size=MAX_WORKERS)
     
     print("\nStarting space creation...")
     created_spaces = []
-    for root_space in SPACE_HIERARCHY:
-        create_space_tree(client, root_space, created_spaces=created_spaces)
+    if CREATION_MODE == 'reconcile':
+        reconcile_space_tree(client, space_hierarchy, MAX_WORKERS, created_spaces)
+    elif CREATION_MODE == 'level':
+        create_space_tree_by_level(client, space_hierarchy, MAX_WORKERS, created_spaces)
+    else:
+        for root_space in space_hierarchy:
+            create_space_tree(client, root_space, created_spaces=created_spaces)
     
     print(f"\nSpace creation completed!")
     print(f"Total spaces created: {len(created_spaces)}")
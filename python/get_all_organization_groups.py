@@ -1,84 +1,71 @@
 import requests
-import pandas as pd
+import lightdash.groups
+from lightdash.export import EXPORT_EXTENSIONS, stream_export
+from lightdash.instrumentation import instrument_session
+from lightdash.records import Group, response_items
 
 API_URL = 'https://<yourinstance>.lightdash.cloud/api/v1/org/groups'
+GROUP_URL = API_URL.replace('/org/groups', '/groups/{group_uuid}')
 API_KEY = '<yourkey>'
-EXPORT_METHOD = 'excel' # or 'csv'
+EXPORT_METHOD = 'excel' # or 'csv' or 'parquet'
+GROUP_COLUMNS = ['Group', 'Email', 'Name']
+GROUP_PAGE_SIZE = lightdash.groups.GROUP_PAGE_SIZE
+# Members returned per request. Larger groups are paged with MEMBER_PAGE_WORKERS requests in flight.
+MEMBER_PAGE_SIZE = lightdash.groups.MEMBER_PAGE_SIZE
+MEMBER_PAGE_WORKERS = lightdash.groups.MEMBER_PAGE_WORKERS
 
 session = requests.Session()
 session.headers.update({
     'Authorization': f'ApiKey {API_KEY}',
     'Content-Type': 'application/json',
 })
+# Report requests to lightdash.instrumentation hooks, e.g. with LIGHTDASH_REQUEST_STATS=1
+instrument_session(session)
 
-def fetch_groups(include_members=10_000):
+def fetch_groups_page(page=1, page_size=GROUP_PAGE_SIZE, include_members=MEMBER_PAGE_SIZE):
     params = {
+        'page': page,
+        'pageSize': page_size,
         'includeMembers': include_members,
     }
-    
     response = session.get(API_URL, params=params)
     response.raise_for_status()
-    return response.json()
+    return response.json()['results']
 
-def parse_groups(data):
-    users = []
-    
-    # Handle different possible response structures
-    groups_data = None
-    if isinstance(data, dict):
-        if 'results' in data and isinstance(data['results'], dict) and 'data' in data['results']:
-            # Structure: {"status": "ok", "results": {"data": [groups]}}
-            groups_data = data['results']['data']
-        elif 'results' in data and isinstance(data['results'], list):
-            # Structure: {"results": [groups]}
-            groups_data = data['results']
-        elif 'data' in data:
-            # Structure: {"data": [groups]}
-            groups_data = data['data']
-        else:
-            return users
-    elif isinstance(data, list):
-        groups_data = data
-    else:
-        return users
-    
-    for group in groups_data:
-        if not isinstance(group, dict):
-            continue
-            
-        group_name = group.get('name', 'Unknown Group')
-        
-        # Handle different member structures
-        members = []
-        if 'members' in group:
-            members = group['members']
-        elif 'memberUuids' in group:
-            # If we only have UUIDs, we can't get names/emails
+def fetch_group_members_page(group_uuid, offset, limit=MEMBER_PAGE_SIZE):
+    params = {
+        'includeMembers': limit,
+        'offset': offset,
+    }
+    response = session.get(GROUP_URL.format(group_uuid=group_uuid), params=params)
+    response.raise_for_status()
+    return response.json()['results'].get('members', [])
+
+def iter_groups():
+    """Yield every group with all of its members, one page of groups at a time"""
+    return lightdash.groups.iter_groups(
+        fetch_groups_page, fetch_group_members_page,
+        page_size=GROUP_PAGE_SIZE, member_page_size=MEMBER_PAGE_SIZE, member_workers=MEMBER_PAGE_WORKERS,
+    )
+
+def iter_group_members(data):
+    """Yield one row per group member from an org groups response"""
+    # The response shape ({"results": {"data": [...]}}, {"results": [...]}, {"data": [...]},
+    # a list, or groups yielded incrementally by iter_groups) is detected once, not per group
+    for group_data in response_items(data):
+        if not isinstance(group_data, dict):
             continue
-        else:
+        group = Group.from_api(group_data)
+        # If we only have UUIDs, we can't get names/emails
+        if group.members is None:
             continue
-        
-        for member in members:
-            if not isinstance(member, dict):
-                continue
-                
-            email = member.get('email', 'Unknown Email')
-            first_name = member.get('firstName', '')
-            last_name = member.get('lastName', '')
-            full_name = f"{first_name} {last_name}".strip() or 'Unknown Name'
-            
-            users.append({
-                'Group': group_name,
-                'Email': email,
-                'Name': full_name,
-            })
-    
-    return users
 
-def fetch_all_groups():
-    result = fetch_groups()
-    all_users = parse_groups(result)
-    return all_users
+        for member in group.members:
+            yield {
+                'Group': group.name,
+                'Email': member.email or 'Unknown Email',
+                'Name': member.name or 'Unknown Name',
+            }
 
 if __name__ == "__main__":
     # Validate API token
@@ -87,28 +74,26 @@ if __name__ == "__main__":
         exit(1)
     
     try:
-        all_users_data = fetch_all_groups()
+        groups = set()
+        
+        def rows():
+            for row in iter_group_members(iter_groups()):
+                groups.add(row['Group'])
+                yield row
         
-        if not all_users_data:
+        # Rows are written as they are parsed instead of building a DataFrame first
+        filename = f"lightdash_groups.{EXPORT_EXTENSIONS.get(EXPORT_METHOD, EXPORT_METHOD)}"
+        exported = stream_export(rows(), filename, GROUP_COLUMNS, EXPORT_METHOD)
+        
+        if not exported:
             print("⚠️  No user data found.")
         else:
-            df = pd.DataFrame(all_users_data)
-            
-            if EXPORT_METHOD == 'excel':
-                filename = 'lightdash_groups.xlsx'
-                df.to_excel(filename, index=False)
-                print(f"✅ Excel export successful: {filename}")
-            elif EXPORT_METHOD == 'csv':
-                filename = 'lightdash_groups.csv'
-                df.to_csv(filename, index=False)
-                print(f"✅ CSV export successful: {filename}")
-            else:
-                raise ValueError(f"Invalid export method: {EXPORT_METHOD}. Use 'csv' or 'excel'.")
+            print(f"✅ {EXPORT_METHOD.capitalize()} export successful: {filename}")
             
             # Show summary
             print(f"\n📊 Summary:")
-            print(f"Total users exported: {len(all_users_data)}")
-            print(f"Unique groups: {df['Group'].nunique() if not df.empty else 0}")
+            print(f"Total users exported: {exported}")
+            print(f"Unique groups: {len(groups)}")
             
     except Exception as e:
         print(f"❌ Script failed: {e}")
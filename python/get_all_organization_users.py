@@ -1,15 +1,21 @@
 import requests
-import pandas as pd
+from lightdash.export import EXPORT_EXTENSIONS, stream_export
+from lightdash.instrumentation import instrument_session
+from lightdash.pagination import paginate
+from lightdash.records import User
 
 API_URL = 'https://<yourinstance>.lightdash.cloud/api/v1/org/users'
 API_KEY = '<yourkey>'
-EXPORT_METHOD = 'excel' # or 'csv'
+EXPORT_METHOD = 'excel' # or 'csv' or 'parquet'
+USER_COLUMNS = ['Name', 'Email', 'Role', 'Groups']
 
 session = requests.Session()
 session.headers.update({
     'Authorization': f'ApiKey {API_KEY}',
     'Content-Type': 'application/json',
 })
+# Report requests to lightdash.instrumentation hooks, e.g. with LIGHTDASH_REQUEST_STATS=1
+instrument_session(session)
 
 def fetch_users(page=1, page_size=10, include_groups=10000):
     params = {
@@ -21,45 +27,23 @@ def fetch_users(page=1, page_size=10, include_groups=10000):
     response.raise_for_status()
     return response.json()
 
-def parse_users(data):
-    users = []
-    for user in data['results']['data']:
-        groups = ', '.join(group['name'] for group in user.get('groups', []))
-        users.append({
-            'Name': f"{user['firstName']} {user['lastName']}".strip(),
-            'Email': user['email'],
-            'Role': user['role'],
-            'Groups': groups,
-        })
-    return users
-
-def fetch_all_users():
-    all_users = []
-    page = 1
-    page_size = 10
-
-    while True:
-        result = fetch_users(page=page, page_size=page_size)
-        users_data = parse_users(result)
-        all_users.extend(users_data)
-
-        # Check if there are more pages
-        total_pages = result['results']['pagination']['totalPageCount']
-        if page >= total_pages:
-            break
-        page += 1
-
-    return all_users
-
-all_users_data = fetch_all_users()
-
-df = pd.DataFrame(all_users_data)
+def parse_user(user):
+    user = User.from_api(user)
+    return {
+        'Name': user.name,
+        'Email': user.email,
+        'Role': user.role,
+        'Groups': ', '.join(user.group_names),
+    }
 
-if EXPORT_METHOD == 'excel':
-    df.to_excel('lightdash_users.xlsx', index=False)
-    print("Excel export successful!: lightdash_users.xlsx")
-elif EXPORT_METHOD == 'csv':
-    df.to_csv('lightdash_users.csv', index=False)
-    print("CSV export successful!: lightdash_users.csv")
-else:
-    raise ValueError(f"Invalid export method: {EXPORT_METHOD}. Use 'csv' or 'excel'.")
\ No newline at end of file
+def iter_users(page_size=100, prefetch=4):
+    """Lazily yield parsed users, fetching up to `prefetch` pages ahead"""
+    for user in paginate(lambda page, size: fetch_users(page=page, page_size=size)['results'],
+                         page_size=page_size, prefetch=prefetch):
+        yield parse_user(user)
+
+if __name__ == "__main__":
+    # Rows are written as pages arrive, so memory stays flat however large the organization is
+    filename = f"lightdash_users.{EXPORT_EXTENSIONS.get(EXPORT_METHOD, EXPORT_METHOD)}"
+    count = stream_export(iter_users(), filename, USER_COLUMNS, EXPORT_METHOD)
+    print(f"{EXPORT_METHOD.capitalize()} export successful!: {filename} ({count} users)")
@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 import json
-from typing import Dict, List, Any
+from typing import List
 from lightdash.api_client import LightdashApiClient
+from lightdash.access import (
+    PROJECT_ROLES, access_matrix_wide, access_to_records, compute_access_matrix, compute_project_access,
+    users_frame,
+)
 
 # How to run: 
 # poetry run python get_complete_project_access.py
@@ -10,26 +14,16 @@ from lightdash.api_client import LightdashApiClient
 BASE_URL = "https://YOUR_LIGHTDASH_BASE_URL.lightdash.cloud/api/v1/"
 PROJECT_UUID = "YOUR_PROJECT_UUID"  # Replace with actual project UUID
 API_TOKEN = "YOUR_API_TOKEN"  # Replace with actual API token
+# 'pandas' resolves roles with vectorized joins (fast for large organizations), 'python' uses plain dicts
+ENGINE = "pandas"
+# Set to several project UUIDs to compute one user x project access matrix instead
+PROJECT_UUIDS: List[str] = []
+# .csv or .parquet (requires pyarrow). 'long' writes one row per user and project with access,
+# 'wide' one row per user and one column per project.
+MATRIX_OUTPUT = "project_access_matrix.csv"
+MATRIX_LAYOUT = "long"
 
-def fetch_all_org_users(client: LightdashApiClient) -> List[Dict[str, Any]]:
-    """Fetch all organization users with pagination"""
-    all_users = []
-    page = 1
-    page_size = 50  
-    
-    while True:
-        result = client.org_users_with_pagination(page=page, page_size=page_size)
-        users_data = result.get('data', [])
-        all_users.extend(users_data)
-        
-        # Check if there are more pages
-        pagination = result.get('pagination', {})
-        total_pages = pagination.get('totalPageCount', 1)
-        if page >= total_pages:
-            break
-        page += 1
-    
-    return all_users
+ROLE_RANK = {role: rank for rank, role in enumerate(PROJECT_ROLES)}
 
 def get_complete_project_access(client: LightdashApiClient, project_uuid: str):
     """Get complete project access information using the API client"""
@@ -37,9 +31,6 @@ def get_complete_project_access(client: LightdashApiClient, project_uuid: str):
     print("=" * 60)
     
     # Fetch all required data using the API client
-    print("📊 Fetching organization users...")
-    org_users = fetch_all_org_users(client)
-    
     print("🔑 Fetching project access list...")
     project_access = client.get_project_access_list(project_uuid)
     
@@ -47,8 +38,8 @@ def get_complete_project_access(client: LightdashApiClient, project_uuid: str):
     project_groups = client.project_group_accesses(project_uuid)
     
     print("🏢 Fetching organization groups...")
-    org_groups_response = client.org_groups()
-    org_groups = org_groups_response.get('data', []) if isinstance(org_groups_response, dict) else org_groups_response
+    # Every group with all of its members, large groups are paged instead of truncated
+    org_groups = client.org_groups()
     
     # Create lookup dictionaries
     group_lookup = {g["uuid"]: g for g in org_groups}
@@ -77,9 +68,12 @@ def get_complete_project_access(client: LightdashApiClient, project_uuid: str):
                     "role": group_role
                 })
     
-    # Generate complete user list
+    # Generate complete user list, streaming organization users page by page
+    print("📊 Fetching organization users...")
     complete_access = []
-    for user in org_users:
+    total_org_users = 0
+    for user in client.iter_org_users(page_size=50):
+        total_org_users += 1
         user_uuid = user["userUuid"]
         access_sources = []
         
@@ -110,9 +104,7 @@ def get_complete_project_access(client: LightdashApiClient, project_uuid: str):
         
         if access_sources:
             # Determine highest role
-            role_hierarchy = ["viewer", "interactive_viewer", "editor", "developer", "admin"]
-            highest_role = max(access_sources, 
-                             key=lambda x: role_hierarchy.index(x["role"]) if x["role"] in role_hierarchy else 0)
+            highest_role = max(access_sources, key=lambda x: ROLE_RANK.get(x["role"], 0))
             
             complete_access.append({
                 "name": f"{user['firstName']} {user['lastName']}",
@@ -123,18 +115,67 @@ def get_complete_project_access(client: LightdashApiClient, project_uuid: str):
             })
     
     return complete_access, {
-        "totalOrgUsers": len(org_users),
+        "totalOrgUsers": total_org_users,
         "directProjectMembers": len(project_access),
         "groupsWithAccess": len(project_groups),
         "usersWithAccess": len(complete_access)
     }
 
+def get_complete_project_access_vectorized(client: LightdashApiClient, project_uuid: str):
+    """Same result as get_complete_project_access, computed with pandas joins and group-max"""
+    print(f"Fetching complete project access for: {project_uuid}")
+    print("=" * 60)
+    
+    print("🔑 Fetching project access list...")
+    project_access = client.get_project_access_list(project_uuid)
+    
+    print("👥 Fetching project group access...")
+    project_groups = client.project_group_accesses(project_uuid)
+    
+    print("🏢 Fetching organization groups...")
+    org_groups = client.org_groups()
+    
+    print("📊 Fetching organization users...")
+    users = users_frame(client.iter_org_users(page_size=50))
+    
+    access, sources = compute_project_access(users, project_access, project_groups, org_groups)
+    complete_access = access_to_records(access, sources)
+    
+    return complete_access, {
+        "totalOrgUsers": len(users),
+        "directProjectMembers": len(project_access),
+        "groupsWithAccess": len(project_groups),
+        "usersWithAccess": len(complete_access)
+    }
+
+def export_access_matrix(client: LightdashApiClient, project_uuids: List[str]):
+    """Compute the access matrix for several projects and write it to MATRIX_OUTPUT"""
+    print(f"Fetching access for {len(project_uuids)} projects")
+    matrix = compute_access_matrix(client, project_uuids)
+    output = access_matrix_wide(matrix) if MATRIX_LAYOUT == "wide" else matrix
+    if MATRIX_OUTPUT.endswith(".parquet"):
+        output.to_parquet(MATRIX_OUTPUT, index=MATRIX_LAYOUT == "wide")
+    else:
+        output.to_csv(MATRIX_OUTPUT, index=MATRIX_LAYOUT == "wide")
+    
+    print("\n📊 STATISTICS:")
+    print("-" * 30)
+    print(f"Projects: {len(project_uuids)}")
+    print(f"Users with access to any project: {matrix['userUuid'].nunique()}")
+    print(f"User/project grants: {len(matrix)}")
+    print(f"\n💾 Results exported to: {MATRIX_OUTPUT}")
+
 if __name__ == "__main__":
     # Validate required parameters
     if not API_TOKEN or API_TOKEN == "YOUR_API_TOKEN":
         print("❌ Error: Please update API_TOKEN in the script with your actual API token.")
         exit(1)
     
+    if PROJECT_UUIDS:
+        client = LightdashApiClient(BASE_URL, API_TOKEN)
+        export_access_matrix(client, PROJECT_UUIDS)
+        exit(0)
+    
     if not PROJECT_UUID or PROJECT_UUID == "YOUR_PROJECT_UUID":
         print("❌ Error: Please update PROJECT_UUID in the script with your actual project UUID.")
         exit(1)
@@ -146,7 +187,10 @@ if __name__ == "__main__":
         
         print("🔍 Starting data fetch...")
         
-        users_with_access, stats = get_complete_project_access(client, PROJECT_UUID)
+        if ENGINE == "pandas":
+            users_with_access, stats = get_complete_project_access_vectorized(client, PROJECT_UUID)
+        else:
+            users_with_access, stats = get_complete_project_access(client, PROJECT_UUID)
         
         print("\n📊 STATISTICS:")
         print("-" * 30)
@@ -0,0 +1,166 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Project roles from least to most privileged
+PROJECT_ROLES = ['viewer', 'interactive_viewer', 'editor', 'developer', 'admin']
+# Organization roles that grant access to every project
+ORG_PROJECT_ROLES = ['admin', 'editor']
+# Source types in the order they are listed. When several sources grant the same role,
+# the first one is reported.
+SOURCE_ORDER = {'organization': 0, 'group': 1, 'project': 2}
+
+
+def role_codes(roles):
+    """Integer codes for role names in PROJECT_ROLES order. Unknown roles rank as viewer."""
+    if isinstance(roles.dtype, pd.CategoricalDtype):
+        # Map the few categories instead of every row
+        category_codes = role_codes(pd.Series(roles.cat.categories, dtype=object))
+        return category_codes[roles.cat.codes.to_numpy()]
+    codes = pd.Categorical(roles, categories=PROJECT_ROLES).codes
+    return np.maximum(codes, 0).astype(np.int8)
+
+
+def users_frame(org_users):
+    """Load organization users (any iterable, e.g. a paginator) into a frame"""
+    users = pd.DataFrame.from_records(
+        ({key: user.get(key) for key in ('userUuid', 'firstName', 'lastName', 'email', 'role')} for user in org_users),
+        columns=['userUuid', 'firstName', 'lastName', 'email', 'role'],
+    )
+    users['name'] = users['firstName'].fillna('') + ' ' + users['lastName'].fillna('')
+    return users
+
+
+def group_member_uuids(group):
+    """Member uuids of a group, handling both 'memberUuids' and 'members' formats"""
+    if 'memberUuids' in group:
+        return group['memberUuids']
+    if 'members' in group:
+        return [m['userUuid'] for m in group['members']]
+    return []
+
+
+def access_sources_frame(users, project_access, project_groups, org_groups):
+    """Every grant on a project from organization role, groups and direct access.
+
+    Users are referenced by their integer position in `users` and the role, type and
+    source columns are categorical, so a row costs a few bytes however many memberships
+    there are. Rows are ordered organization -> groups (in project_groups order) -> direct.
+    """
+    user_index = pd.Index(users['userUuid'])
+    roles = users['role'].to_numpy()
+    group_lookup = {g['uuid']: g for g in org_groups}
+
+    # Each block is (user positions, type, role or array of roles, source label)
+    blocks = [
+        (np.flatnonzero(roles == role), 'organization', role, f'Organization {role}')
+        for role in ORG_PROJECT_ROLES
+    ]
+    for group_access in project_groups:
+        group = group_lookup.get(group_access['groupUuid'])
+        if group is None:
+            continue
+        positions = user_index.get_indexer(group_member_uuids(group))
+        blocks.append((positions[positions >= 0], 'group', group_access['role'], f"Group: {group['name']}"))
+    direct_positions = user_index.get_indexer([u['userUuid'] for u in project_access])
+    direct_roles = np.array([u['role'] for u in project_access], dtype=object)
+    blocks.append((
+        direct_positions[direct_positions >= 0], 'project',
+        direct_roles[direct_positions >= 0], 'Direct project membership',
+    ))
+
+    sizes = [len(positions) for positions, _, _, _ in blocks]
+    # Build categorical columns from per-block codes so no per-row strings are created
+    block_roles = {role for _, _, role, _ in blocks if isinstance(role, str)}
+    role_categories = list(PROJECT_ROLES) + sorted((set(direct_roles) | block_roles) - set(PROJECT_ROLES))
+    role_index = pd.Index(role_categories)
+    label_codes, labels = pd.factorize(pd.Index([label for _, _, _, label in blocks]))
+    type_codes = [list(SOURCE_ORDER).index(source_type) for _, source_type, _, _ in blocks]
+    sources = pd.DataFrame({
+        'user': np.concatenate([positions for positions, _, _, _ in blocks]).astype(np.int64),
+        'type': pd.Categorical.from_codes(np.repeat(type_codes, sizes), categories=list(SOURCE_ORDER)),
+        'role': pd.Categorical.from_codes(np.concatenate([
+            np.full(size, role_index.get_loc(role)) if isinstance(role, str) else role_index.get_indexer(role)
+            for size, (_, _, role, _) in zip(sizes, blocks)
+        ]), categories=role_categories),
+        'source': pd.Categorical.from_codes(np.repeat(label_codes, sizes), categories=labels),
+    })
+    sources['roleCode'] = role_codes(sources['role'])
+    return sources
+
+
+def compute_project_access(org_users, project_access, project_groups, org_groups):
+    """Resolve every user's effective role on one project with vectorized joins.
+
+    Returns (access, sources): `access` has one row per user with any access and their
+    highest role in `finalRole`, `sources` lists every grant that contributed, with
+    `user` being the user's position in `access`'s source users frame.
+    """
+    users = org_users if isinstance(org_users, pd.DataFrame) else users_frame(org_users)
+    sources = access_sources_frame(users, project_access, project_groups, org_groups)
+    # Stable sort keeps the organization -> group -> project order among equal roles
+    ranked = sources.sort_values('roleCode', ascending=False, kind='stable')
+    effective = ranked.drop_duplicates('user')
+    access = users.iloc[effective['user'].to_numpy()][['userUuid', 'name', 'email']].assign(
+        finalRole=effective['role'].astype(object).to_numpy(),
+        finalRoleCode=effective['roleCode'].to_numpy(),
+        user=effective['user'].to_numpy(),
+    )
+    # Report users in organization order, like the user list they came from
+    access = access.sort_values('user', kind='stable').reset_index(drop=True)
+    return access, sources
+
+
+def access_to_records(access, sources):
+    """Convert compute_project_access output to the list-of-dicts format of the script"""
+    sources_by_user = {}
+    for user, source_type, role, source in zip(
+        sources['user'], sources['type'], sources['role'], sources['source']
+    ):
+        sources_by_user.setdefault(user, []).append({'type': source_type, 'role': role, 'source': source})
+    return [
+        {
+            'name': name,
+            'email': email,
+            'userUuid': user_uuid,
+            'finalRole': final_role,
+            'accessSources': sources_by_user[user],
+        }
+        for user, user_uuid, name, email, final_role
+        in zip(access['user'], access['userUuid'], access['name'], access['email'], access['finalRole'])
+    ]
+
+
+def compute_access_matrix(client, project_uuids, max_workers=8):
+    """Effective role of every user on every project in one pass.
+
+    Organization users and groups are fetched once. The access lists of all projects are
+    fetched concurrently while users are downloaded. Returns a long (sparse) frame with one
+    row per (user, project) pair that has access.
+    """
+    def fetch_project(project_uuid):
+        return client.get_project_access_list(project_uuid), client.project_group_accesses(project_uuid)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        projects = [executor.submit(fetch_project, project_uuid) for project_uuid in project_uuids]
+        org_groups = client.org_groups()
+        users = users_frame(client.iter_org_users())
+        frames = []
+        for project_uuid, future in zip(project_uuids, projects):
+            project_access, project_groups = future.result()
+            access, _ = compute_project_access(users, project_access, project_groups, org_groups)
+            frames.append(access[['userUuid', 'email', 'finalRole', 'finalRoleCode']].assign(projectUuid=project_uuid))
+
+    columns = ['userUuid', 'email', 'projectUuid', 'finalRole', 'finalRoleCode']
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    matrix = pd.concat(frames, ignore_index=True)[columns]
+    matrix['projectUuid'] = pd.Categorical(matrix['projectUuid'], categories=list(project_uuids))
+    matrix['finalRole'] = matrix['finalRole'].astype('category')
+    return matrix
+
+
+def access_matrix_wide(matrix):
+    """Pivot a long access matrix to one row per user and one role column per project"""
+    return matrix.pivot(index=['userUuid', 'email'], columns='projectUuid', values='finalRole')
@@ -1,68 +1,198 @@
+import hashlib
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urljoin
 import requests
+from requests.adapters import HTTPAdapter
+
+from lightdash.groups import GROUP_PAGE_SIZE, MEMBER_PAGE_SIZE, iter_groups
+from lightdash.instrumentation import RequestEvent, default_hooks, run_hooks
+from lightdash.pagination import paginate
+from lightdash.retry import RetryPolicy
 
 
 class LightdashApiClient:
-    def __init__(self, base_url, api_key, project_id=None):
+    def __init__(self, base_url, api_key, project_id=None, pool_size=10, max_workers=8,
+                 retry=None, rate_limiter=None, cache=None, hooks=None):
         session = requests.Session()
         session.headers.update({
             'Authorization': f'ApiKey {api_key}',
             'Content-Type': 'application/json',
         })
+        # Size the connection pool so concurrent callers can keep one connection each
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
         self.session = session
         self.base_url = base_url
         self.project_id = project_id
+        self.max_workers = max_workers
+        # Pass RetryPolicy(max_retries=0) to disable retries
+        self.retry = retry if retry is not None else RetryPolicy()
+        # Share one RateLimiter between clients to cap their combined request rate
+        self.rate_limiter = rate_limiter
+        # Optional lightdash.cache.ResponseCache for GET responses
+        self.cache = cache
+        self._cache_namespace = f'{base_url}#{hashlib.sha256(api_key.encode()).hexdigest()[:16]}'
+        # Callables receiving a lightdash.instrumentation.RequestEvent after every call
+        self.hooks = default_hooks(hooks)
 
     def _url(self, path):
         return urljoin(self.base_url, path.lstrip('/'))
 
     def _api_call(self, method, path, **kwargs):
+        if not self.hooks:
+            return self._call(method, path, None, **kwargs)
+        event = RequestEvent(method, path)
+        try:
+            return self._call(method, path, event, **kwargs)
+        except Exception as e:
+            event.error = str(e)
+            raise
+        finally:
+            event.finish()
+            run_hooks(self.hooks, event)
+
+    def _call(self, method, path, event, **kwargs):
+        if self.cache is None:
+            j = self._send(method, path, event, **kwargs)
+        elif method == 'GET':
+            path = '/' + path.lstrip('/')
+            hit, results = self.cache.get(self._cache_namespace, path, kwargs.get('params'))
+            if event is not None:
+                event.cache = 'hit' if hit else 'miss'
+            if hit:
+                return results
+            j = self._send(method, path, event, **kwargs)
+            if j['status'] == 'ok':
+                self.cache.set(self._cache_namespace, path, kwargs.get('params'), j.get('results'))
+        else:
+            try:
+                j = self._send(method, path, event, **kwargs)
+            finally:
+                # Invalidate even when the write failed, the server may have applied it anyway
+                self.cache.invalidate(self._cache_namespace, '/' + path.lstrip('/'))
+        if j['status'] == 'ok':
+            return j.get('results')
+        return j['error']
+
+    def _send(self, method, path, event=None, **kwargs):
         request = requests.Request(method, self._url(path), **kwargs)
-        response = self.session.send(self.session.prepare_request(request))
+        prepared = self.session.prepare_request(request)
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = self.session.send(prepared)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if not self.retry.should_retry(method, attempt):
+                    if event is not None:
+                        event.retries = attempt
+                        event.error = str(e)
+                    raise
+                delay = self.retry.delay(attempt)
+            else:
+                if response.ok or not self.retry.should_retry(method, attempt, response.status_code):
+                    break
+                delay = self.retry.delay(attempt, response)
+                if delay is None:
+                    # The server asked to wait longer than the policy allows
+                    break
+                if response.status_code == 429 and self.rate_limiter is not None:
+                    self.rate_limiter.pause(delay)
+            time.sleep(delay)
+            attempt += 1
+        if event is not None:
+            event.status = response.status_code
+            event.bytes = len(response.content)
+            event.retries = attempt
         if not response.ok:
-            raise ValueError(f'{response.status_code}: {json.dumps(response.json(), indent=2)}')
+            try:
+                body = json.dumps(response.json(), indent=2)
+            except ValueError:
+                body = response.text
+            raise ValueError(f'{response.status_code}: {body}')
         try:
             j = response.json()
         except json.decoder.JSONDecodeError as e:
             print(response.text)
             raise e
-        if j['status'] == 'ok':
-            return j.get('results')
-        return j['error']
+        return j
 
     def health(self):
         return self._api_call('GET', '/health')
 
-    def space_summary_to_detail(self, space_summary):
-        space_detail = {
-            **space_summary,
-            'queries': [
-                self.saved_chart(query['uuid'])
-                for query
-                in space_summary['queries']
-            ],
-            'dashboards': [
-                self.dashboard(dashboard['uuid'])
-                for dashboard
-                in space_summary['dashboards']
-            ]
-        }
-        return space_detail
+    def _fetch_details(self, jobs, errors=None):
+        """Run (kind, fetch, uuid) jobs on a thread pool, returning results in job order.
+
+        Failed fetches are returned as None and recorded in `errors` instead of raising.
+        """
+        if errors is None:
+            errors = []
+        results = [None] * len(jobs)
+        if not jobs:
+            return results
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(fetch, uuid): idx
+                for idx, (kind, fetch, uuid)
+                in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                idx = futures[future]
+                try:
+                    results[idx] = future.result()
+                except Exception as e:
+                    kind, _, uuid = jobs[idx]
+                    print(f'Failed to fetch {kind} {uuid}: {e}')
+                    errors.append({'type': kind, 'uuid': uuid, 'error': str(e)})
+        return results
 
-    def space(self, space_uuid, summary=True):
+    def _space_jobs(self, space_summary):
+        return [
+            ('chart', self.saved_chart, query['uuid'])
+            for query
+            in space_summary['queries']
+        ] + [
+            ('dashboard', self.dashboard, dashboard['uuid'])
+            for dashboard
+            in space_summary['dashboards']
+        ]
+
+    def spaces_summary_to_detail(self, spaces_summary, errors=None):
+        """Fetch the charts and dashboards of several spaces on one shared thread pool"""
+        jobs_per_space = [self._space_jobs(s) for s in spaces_summary]
+        results = iter(self._fetch_details([job for jobs in jobs_per_space for job in jobs], errors))
+        spaces_detail = []
+        for space_summary in spaces_summary:
+            # Items that failed to fetch are dropped, the rest keep their original order
+            queries = [next(results) for _ in space_summary['queries']]
+            dashboards = [next(results) for _ in space_summary['dashboards']]
+            spaces_detail.append({
+                **space_summary,
+                'queries': [q for q in queries if q is not None],
+                'dashboards': [d for d in dashboards if d is not None],
+            })
+        return spaces_detail
+
+    def space_summary_to_detail(self, space_summary, errors=None):
+        """Fetch every chart and dashboard in a space concurrently.
+
+        Pass a list as `errors` to collect items that could not be fetched.
+        """
+        return self.spaces_summary_to_detail([space_summary], errors)[0]
+
+    def space(self, space_uuid, summary=True, errors=None):
         space_summary = self._api_call('GET', f'/projects/{self.project_id}/spaces/{space_uuid}')
-        return space_summary if summary else self.space_summary_to_detail(space_summary)
+        return space_summary if summary else self.space_summary_to_detail(space_summary, errors)
 
-    def spaces(self, summary=True):
+    def spaces(self, summary=True, errors=None):
         spaces_summary = self._api_call('GET', f'/projects/{self.project_id}/spaces')
         if summary:
             return spaces_summary
-        return [
-            self.space_summary_to_detail(s)
-            for s
-            in spaces_summary
-        ]
+        return self.spaces_summary_to_detail(spaces_summary, errors)
 
     def dashboard(self, dashboard_uuid):
         return self._api_call('GET', f'/dashboards/{dashboard_uuid}')
@@ -93,6 +223,9 @@ class LightdashApiClient:
             print(f'Coping dashboard {idx+1} of {len(space["dashboards"])}: {dashboard["name"]}')
             self.create_dashboard({**dashboard, 'spaceUuid': empty_space['uuid']})
 
+    def update_space(self, space_uuid, space):
+        return self._api_call('PATCH', f'/projects/{self.project_id}/spaces/{space_uuid}', json=space)
+
     def delete_space(self, space_uuid):
         return self._api_call('DELETE', f'/projects/{self.project_id}/spaces/{space_uuid}')
     
@@ -123,10 +256,26 @@ class LightdashApiClient:
     def update_user_attribute(self, attribute_uuid, attribute):
         return self._api_call('PUT', f'/org/attributes/{attribute_uuid}', json=attribute)
 
-    def org_groups(self, include_members=10000):
-        """Get all organization groups with member information"""
-        params = {'includeMembers': include_members}
+    def org_groups(self, member_page_size=MEMBER_PAGE_SIZE):
+        """Get all organization groups with all of their members"""
+        return list(self.iter_org_groups(member_page_size=member_page_size))
+
+    def org_groups_page(self, page=1, page_size=GROUP_PAGE_SIZE, include_members=MEMBER_PAGE_SIZE):
+        """One page of organization groups with up to `include_members` members each"""
+        params = {'page': page, 'pageSize': page_size, 'includeMembers': include_members}
         return self._api_call('GET', '/org/groups', params=params)
+
+    def group_members_page(self, group_uuid, offset, limit=MEMBER_PAGE_SIZE):
+        """Up to `limit` members of a group, starting at `offset`"""
+        params = {'includeMembers': limit, 'offset': offset}
+        return self._api_call('GET', f'/groups/{group_uuid}', params=params).get('members', [])
+
+    def iter_org_groups(self, page_size=GROUP_PAGE_SIZE, member_page_size=MEMBER_PAGE_SIZE):
+        """Lazily yield every organization group with all of its members, paging large groups"""
+        return iter_groups(
+            self.org_groups_page, self.group_members_page,
+            page_size=page_size, member_page_size=member_page_size,
+        )
     
     def project_group_accesses(self, project_uuid):
         """Get group access permissions for a specific project"""
@@ -140,3 +289,11 @@ class LightdashApiClient:
             'includeGroups': include_groups,
         }
         return self._api_call('GET', '/org/users', params=params)
+
+    def iter_org_users(self, page_size=100, prefetch=4, include_groups=10000):
+        """Lazily yield every organization user, prefetching `prefetch` pages ahead"""
+        return paginate(
+            lambda page, size: self.org_users_with_pagination(page, size, include_groups),
+            page_size=page_size,
+            prefetch=prefetch,
+        )
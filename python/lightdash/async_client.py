@@ -0,0 +1,95 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from lightdash.api_client import LightdashApiClient
+from lightdash.pagination import apaginate
+
+
+class AsyncLightdashApiClient:
+    """Asyncio front-end for LightdashApiClient.
+
+    Every public method of LightdashApiClient is available as a coroutine with the same
+    arguments. Requests run on a bounded worker pool that shares a single connection pool,
+    so at most `max_concurrency` requests are in flight at any time.
+    """
+
+    def __init__(self, base_url, api_key, project_id=None, max_concurrency=16, **client_kwargs):
+        client = LightdashApiClient(base_url, api_key, project_id, pool_size=max_concurrency, **client_kwargs)
+        self._init(client, max_concurrency)
+
+    @classmethod
+    def from_client(cls, client, max_concurrency=16):
+        """Wrap an existing LightdashApiClient, sharing its session and settings"""
+        self = cls.__new__(cls)
+        self._init(client, max_concurrency)
+        return self
+
+    def _init(self, client, max_concurrency):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='lightdash')
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+        call.__name__ = name
+        call.__doc__ = attr.__doc__
+        return call
+
+    async def run(self, fn, *args, **kwargs):
+        """Run a blocking call on the worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    async def _fetch_details(self, jobs, errors):
+        results = await asyncio.gather(*[fetch(uuid) for kind, fetch, uuid in jobs], return_exceptions=True)
+        for (kind, _, uuid), result in zip(jobs, results):
+            if isinstance(result, Exception):
+                print(f'Failed to fetch {kind} {uuid}: {result}')
+                errors.append({'type': kind, 'uuid': uuid, 'error': str(result)})
+        return [r for r in results if not isinstance(r, Exception)]
+
+    async def space_summary_to_detail(self, space_summary, errors=None):
+        if errors is None:
+            errors = []
+        queries, dashboards = await asyncio.gather(
+            self._fetch_details([('chart', self.saved_chart, q['uuid']) for q in space_summary['queries']], errors),
+            self._fetch_details([('dashboard', self.dashboard, d['uuid']) for d in space_summary['dashboards']], errors),
+        )
+        return {
+            **space_summary,
+            'queries': queries,
+            'dashboards': dashboards,
+        }
+
+    async def space(self, space_uuid, summary=True, errors=None):
+        space_summary = await self.run(self.client.space, space_uuid)
+        return space_summary if summary else await self.space_summary_to_detail(space_summary, errors)
+
+    async def spaces(self, summary=True, errors=None):
+        spaces_summary = await self.run(self.client.spaces)
+        if summary:
+            return spaces_summary
+        return list(await asyncio.gather(*[self.space_summary_to_detail(s, errors) for s in spaces_summary]))
+
+    async def iter_org_users(self, page_size=100, prefetch=4, include_groups=10000):
+        """Async generator over every organization user, prefetching `prefetch` pages ahead"""
+        async def fetch_page(page, size):
+            return await self.org_users_with_pagination(page, size, include_groups)
+        async for user in apaginate(fetch_page, page_size=page_size, prefetch=prefetch):
+            yield user
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.client.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
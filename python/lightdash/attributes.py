@@ -0,0 +1,146 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+
+def normalize_emails(emails):
+    """Lower-cased, stripped emails, so 'Jane@Example.com ' matches 'jane@example.com'"""
+    return pd.Series(emails, dtype=object).fillna('').astype(str).str.strip().str.lower()
+
+
+def email_index(users):
+    """Series of userUuid indexed by normalized email, built once from users() output.
+
+    When two users share an email after normalization, the first one wins.
+    """
+    users = users if isinstance(users, pd.DataFrame) else pd.DataFrame.from_records(users, columns=['userUuid', 'email'])
+    index = pd.Series(users['userUuid'].to_numpy(), index=normalize_emails(users['email']).to_numpy())
+    return index[~index.index.duplicated()]
+
+
+def match_users(rows, users):
+    """Add a userUuid column to `rows` (with an 'email' column) with a single hash join.
+
+    Unknown emails get a missing userUuid. `users` can be users() output or an email_index.
+    """
+    index = users if isinstance(users, pd.Series) else email_index(users)
+    return rows.assign(userUuid=normalize_emails(rows['email']).map(index).to_numpy())
+
+
+def values_fingerprint(pairs):
+    """Order-independent SHA-256 of (userUuid, value) pairs, equal for equal value sets"""
+    digest = hashlib.sha256()
+    for user_uuid, value in sorted(set((str(u), str(v)) for u, v in pairs)):
+        digest.update(f'{user_uuid}\t{value}\n'.encode())
+    return digest.hexdigest()
+
+
+def attribute_payload(attribute, values):
+    """PUT /org/attributes body for `attribute` with `values` ({userUuid: value}) as its users"""
+    payload = {
+        'name': attribute['name'],
+        'users': [{'userUuid': user_uuid, 'value': value} for user_uuid, value in values.items()],
+    }
+    for key in ('description', 'attributeDefault'):
+        if key in attribute:
+            payload[key] = attribute[key]
+    return payload
+
+
+def attribute_rows(rows, attribute_name=None):
+    """CSV rows as a long frame with email, attribute and value columns.
+
+    Accepts a long CSV (email, attribute, value), a single attribute CSV (email, value) for
+    `attribute_name`, or a wide CSV with an email column and one column per attribute name.
+    Empty cells of a wide CSV are ignored.
+    """
+    if 'attribute' in rows.columns:
+        return rows[['email', 'attribute', 'value']]
+    if 'value' in rows.columns:
+        if not attribute_name:
+            raise ValueError('An attribute name is required for a CSV with email and value columns')
+        return rows[['email', 'value']].assign(attribute=attribute_name)[['email', 'attribute', 'value']]
+    long = rows.melt(id_vars='email', var_name='attribute', value_name='value')
+    return long[long['value'].notna() & (long['value'] != '')].reset_index(drop=True)
+
+
+def _merge_values(attribute, matched):
+    """(payload, summary) for `matched` rows, which already have their userUuid column"""
+    found = matched['userUuid'].notna()
+    current_pairs = [(user['userUuid'], user['value']) for user in attribute.get('users') or []]
+    current_values = dict(current_pairs)
+    values = dict(current_values)
+    new_values = matched[found].drop_duplicates('userUuid', keep='last')
+    current = new_values['userUuid'].map(current_values)
+    unchanged = (current == new_values['value']).sum()
+    values.update(zip(new_values['userUuid'], new_values['value']))
+    fingerprint = values_fingerprint(values.items())
+    summary = {
+        'rows': len(matched),
+        'matched': int(found.sum()),
+        'unmatched': int((~found).sum()),
+        'unchanged': int(unchanged),
+        'changed': len(new_values) - int(unchanged),
+        'unmatched_emails': matched.loc[~found, 'email'].tolist(),
+        # Values that differ from the attribute's current ones, i.e. the size of the write
+        'added': int(current.isna().sum()),
+        'updated': int((current.notna() & (current != new_values['value'])).sum()),
+        'fingerprint': fingerprint,
+        # False when the new values equal the current ones and the PUT can be skipped
+        'needs_update': fingerprint != values_fingerprint(current_pairs),
+    }
+    return attribute_payload(attribute, values), summary
+
+
+def plan_attribute_update(attribute, rows, users):
+    """Merge the email/value `rows` of a CSV into an attribute's current values.
+
+    Returns (payload, summary). `payload` is the full body for update_user_attribute:
+    existing values are kept and matched rows override them (the last row wins for a
+    repeated email). `summary` counts rows that matched a user, did not match, or already
+    had the value, and lists the unmatched emails.
+    """
+    return _merge_values(attribute, match_users(rows, users))
+
+
+def plan_attribute_updates(attributes, rows, users):
+    """Plans for every attribute named in the long `rows` (see attribute_rows).
+
+    Emails are matched against `users` once for all attributes. Returns (plans, unknown):
+    `plans` is a list of (attribute, payload, summary) in CSV order, and `unknown` lists
+    attribute names that do not exist in the organization.
+    """
+    by_name = {attribute['name']: attribute for attribute in attributes}
+    matched = match_users(rows, users)
+    plans = []
+    unknown = []
+    for name, group in matched.groupby('attribute', sort=False):
+        attribute = by_name.get(name)
+        if attribute is None:
+            unknown.append(name)
+            continue
+        plans.append((attribute, *_merge_values(attribute, group)))
+    return plans, unknown
+
+
+def apply_attribute_updates(client, plans, max_workers=8):
+    """Send the PUTs of the plans whose values differ from the current ones, concurrently.
+
+    Returns (updated, errors): the names of the updated attributes and {name: error}.
+    """
+    pending = [(attribute, payload) for attribute, payload, summary in plans if summary['needs_update']]
+    updated = []
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            (attribute['name'], executor.submit(client.update_user_attribute, attribute['uuid'], payload))
+            for attribute, payload in pending
+        ]
+        for name, future in futures:
+            try:
+                future.result()
+                updated.append(name)
+            except Exception as e:
+                errors[name] = str(e)
+    return updated, errors
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Seconds to keep a GET response, matched by longest path prefix. 0 disables caching.
+DEFAULT_TTLS = {
+    '/saved/': 3600,
+    '/dashboards/': 3600,
+    '/org/users': 300,
+    '/org/groups': 300,
+    '/health': 0,
+}
+
+
+def invalidation_prefixes(path):
+    """Path prefixes whose cached responses may be stale after a write to `path`.
+
+    A write invalidates everything under its first two path segments, e.g.
+    `/projects/{uuid}` or `/org/attributes`. Writes to a chart, dashboard or space also
+    invalidate project-level reads, because space listings embed their contents.
+    """
+    segments = [s for s in path.split('/') if s]
+    prefixes = ['/' + '/'.join(segments[:2])]
+    if segments and segments[0] in ('saved', 'dashboards', 'spaces'):
+        prefixes.append('/projects/')
+    return prefixes
+
+
+class ResponseCache:
+    """Cache for GET responses with an in-memory LRU and an optional SQLite store.
+
+    Entries are keyed by a hash of the request (namespace, path and query parameters), so
+    one cache and one SQLite file can be shared by clients for different instances.
+    Pass `path` to persist responses across runs.
+    """
+
+    def __init__(self, max_entries=1024, default_ttl=60, ttls=None, path=None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, namespace TEXT, path TEXT, expires_at REAL, value TEXT)'
+            )
+            self._db.execute('DELETE FROM responses WHERE expires_at <= ?', (time.time(),))
+            self._db.commit()
+
+    def ttl_for(self, path):
+        matches = [prefix for prefix in self.ttls if path.startswith(prefix)]
+        return self.ttls[max(matches, key=len)] if matches else self.default_ttl
+
+    @staticmethod
+    def key(namespace, path, params=None):
+        request = json.dumps([namespace, path, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(request.encode()).hexdigest()
+
+    def get(self, namespace, path, params=None):
+        """Return (hit, value) for a cached GET"""
+        key = self.key(namespace, path, params)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[2] > now:
+                    self._entries.move_to_end(key)
+                    return True, json.loads(entry[3])
+                del self._entries[key]
+            if self._db is None:
+                return False, None
+            row = self._db.execute(
+                'SELECT value, expires_at FROM responses WHERE key = ? AND expires_at > ?', (key, now)
+            ).fetchone()
+            if row is None:
+                return False, None
+            self._remember(key, (namespace, path, row[1], row[0]))
+            return True, json.loads(row[0])
+
+    def set(self, namespace, path, params, value):
+        ttl = self.ttl_for(path)
+        if ttl <= 0:
+            return
+        key = self.key(namespace, path, params)
+        expires_at = time.time() + ttl
+        # Entries are stored serialised so callers can mutate what they get back
+        value = json.dumps(value)
+        with self._lock:
+            self._remember(key, (namespace, path, expires_at, value))
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                    (key, namespace, path, expires_at, value),
+                )
+                self._db.commit()
+
+    def invalidate(self, namespace, path):
+        """Drop every cached response that a write to `path` may have changed"""
+        prefixes = invalidation_prefixes(path)
+        with self._lock:
+            stale = [
+                key for key, (ns, cached_path, _, _) in self._entries.items()
+                if ns == namespace and cached_path.startswith(tuple(prefixes))
+            ]
+            for key in stale:
+                del self._entries[key]
+            if self._db is not None:
+                for prefix in prefixes:
+                    self._db.execute(
+                        'DELETE FROM responses WHERE namespace = ? AND substr(path, 1, ?) = ?',
+                        (namespace, len(prefix), prefix),
+                    )
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM responses')
+                self._db.commit()
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,74 @@
+import json
+import os
+import threading
+
+
+class CopyJournal:
+    """Append-only JSONL journal of source -> target object mappings.
+
+    Each created object is written and flushed to disk as soon as it exists, so a copy
+    that dies partway through can be resumed without recreating anything. A torn last
+    line from a crash is ignored on load.
+
+    `header` identifies the copy, e.g. the source and target URLs and project uuids, and
+    is the first line of the file. Resuming a journal written for another copy raises
+    ValueError, because its objects were not copied to this target.
+    """
+
+    def __init__(self, path, resume=False, header=None):
+        self.path = path
+        self.header = dict(header or {})
+        self.entries = {}
+        resuming = resume and os.path.exists(path)
+        if resuming:
+            with open(path) as f:
+                lines = f.readlines()
+            saved_header = None
+            for line in lines:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get('kind') == 'header':
+                    saved_header = {k: v for k, v in entry.items() if k != 'kind'}
+                    continue
+                self.entries[(entry['kind'], entry['source'])] = entry
+            if saved_header != self.header and (self.entries or saved_header is not None):
+                raise ValueError(
+                    f'{path} was written for a different copy ({saved_header}, not {self.header}). '
+                    'Use another checkpoint path or start over with resume=False.'
+                )
+        self._file = open(path, 'a' if resuming else 'w')
+        self._lock = threading.Lock()
+        if os.path.getsize(path) == 0:
+            self._write({'kind': 'header', **self.header})
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, kind, source_uuid):
+        return self.entries.get((kind, source_uuid))
+
+    def targets(self, kind):
+        """Mapping of source uuid -> target uuid for every recorded object of `kind`"""
+        return {source: entry['target'] for (k, source), entry in self.entries.items() if k == kind}
+
+    def record(self, kind, source_uuid, target_uuid=None, **extra):
+        entry = {'kind': kind, 'source': source_uuid, 'target': target_uuid, **extra}
+        with self._lock:
+            self._write(entry)
+            self.entries[(kind, source_uuid)] = entry
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,259 @@
+import heapq
+from bisect import bisect_right
+
+import numpy as np
+import pandas as pd
+
+# (min views, max views, label) buckets for the views histogram
+VIEW_BUCKETS = [
+    (0, 0, 'No views'),
+    (1, 10, '1-10 views'),
+    (11, 50, '11-50 views'),
+    (51, 100, '51-100 views'),
+    (101, 500, '101-500 views'),
+    (501, 1000, '501-1000 views'),
+    (1001, float('inf'), '1000+ views'),
+]
+_BUCKET_STARTS = [start for start, _, _ in VIEW_BUCKETS]
+
+# Days since the last update after which a dashboard counts as stale
+STALE_DAYS = 180
+# (upper bound in days, label) buckets for time since the last update
+STALENESS_BUCKETS = [
+    (30, 'Updated this month'),
+    (90, '1-3 months'),
+    (STALE_DAYS, '3-6 months'),
+    (365, '6-12 months'),
+    (float('inf'), '1 year+'),
+]
+# Weights of the 0-100 cleanup priority: few views, long since updated, no description
+PRIORITY_WEIGHTS = {'views': 60, 'staleness': 30, 'description': 10}
+
+
+class _Descending:
+    """Inverts the ordering of a sort key so a min-heap keeps the smallest keys"""
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+
+class TopK:
+    """The `k` items with the largest (or smallest) key seen so far.
+
+    Uses a heap of at most k entries, so pushing n items is O(n log k) time and O(k)
+    memory. Ties keep the item pushed first, like a stable sort would.
+    """
+
+    def __init__(self, k=10, largest=True):
+        self.k = k
+        self.largest = largest
+        self._heap = []
+        self._seq = 0
+
+    def push(self, key, item):
+        self._seq += 1
+        if self.largest:
+            rank = (key, -self._seq)
+        else:
+            rank = _Descending((key, self._seq))
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, (rank, item))
+        elif self._heap[0][0] < rank:
+            heapq.heapreplace(self._heap, (rank, item))
+
+    def items(self):
+        """Kept items, best first"""
+        return [item for _, item in sorted(self._heap, key=lambda entry: entry[0], reverse=True)]
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class DashboardStats:
+    """Every statistic of the find_dashboards.py reports, computed in one pass.
+
+    Tallies are keyed by project, space and creator, so memory grows with the number of
+    those, not with the number of dashboards. Lists of dashboards (top viewed, never
+    viewed, stale, ...) keep only `k` samples each, plus a full count.
+    """
+
+    def __init__(self, stale_before=None, k=10, low_engagement_max=5):
+        # ISO timestamp; dashboards last updated earlier are reported as stale
+        self.stale_before = stale_before
+        self.k = k
+        self.low_engagement_max = low_engagement_max
+
+        # First dashboard seen, used as an example in reports
+        self.first = None
+        self.total = 0
+        self.total_views = 0
+        self.with_description = 0
+        self.pinned = 0
+        self.project_uuids = set()
+        self.space_uuids = set()
+        self.organization_uuids = set()
+        # name -> [dashboards, views, dashboards with a description]
+        self.by_project = {}
+        self.by_space = {}
+        # creator name -> [dashboards, views]
+        self.by_creator = {}
+        self.view_histogram = [0] * len(VIEW_BUCKETS)
+
+        self.zero_views = 0
+        self.low_engagement = 0
+        self.stale = 0
+        self.no_description = 0
+        self.top_viewed = TopK(k)
+        self.recently_updated = TopK(k)
+        self.oldest_zero_views = TopK(k, largest=False)
+        self.least_viewed_low_engagement = TopK(k, largest=False)
+        self.least_recently_updated = TopK(k, largest=False)
+        self.most_viewed_no_description = TopK(k)
+
+    def add(self, dashboard):
+        views = dashboard.views
+        has_description = dashboard.has_description
+        if self.first is None:
+            self.first = dashboard
+        self.total += 1
+        self.total_views += views
+        if has_description:
+            self.with_description += 1
+        else:
+            self.no_description += 1
+            self.most_viewed_no_description.push(views, dashboard)
+        if dashboard.is_pinned:
+            self.pinned += 1
+        if dashboard.project_uuid:
+            self.project_uuids.add(dashboard.project_uuid)
+        if dashboard.space_uuid:
+            self.space_uuids.add(dashboard.space_uuid)
+        if dashboard.organization_uuid:
+            self.organization_uuids.add(dashboard.organization_uuid)
+
+        for tally, name in ((self.by_project, dashboard.project_name), (self.by_space, dashboard.space_name)):
+            group = tally.get(name)
+            if group is None:
+                group = tally[name] = [0, 0, 0]
+            group[0] += 1
+            group[1] += views
+            group[2] += has_description
+        creator = dashboard.created_by_name.strip()
+        if creator and creator != 'Unknown':
+            group = self.by_creator.get(creator)
+            if group is None:
+                group = self.by_creator[creator] = [0, 0]
+            group[0] += 1
+            group[1] += views
+
+        self.view_histogram[bisect_right(_BUCKET_STARTS, views) - 1] += 1
+        self.top_viewed.push(views, dashboard)
+        if views == 0:
+            self.zero_views += 1
+            self.oldest_zero_views.push(dashboard.created_at or '', dashboard)
+        elif views <= self.low_engagement_max:
+            self.low_engagement += 1
+            self.least_viewed_low_engagement.push(views, dashboard)
+
+        last_updated = dashboard.last_updated_at
+        if last_updated:
+            self.recently_updated.push(last_updated, dashboard)
+            if self.stale_before and last_updated < self.stale_before:
+                self.stale += 1
+                self.least_recently_updated.push(last_updated, dashboard)
+
+    def update(self, dashboards):
+        for dashboard in dashboards:
+            self.add(dashboard)
+        return self
+
+    @property
+    def average_views(self):
+        return self.total_views / self.total if self.total else 0
+
+    @staticmethod
+    def ranked(tally):
+        """(name, dashboards, views, ...) rows of a tally, most dashboards first"""
+        return sorted(((name, *values) for name, values in tally.items()), key=lambda row: row[1], reverse=True)
+
+
+def parse_timestamps(values):
+    """ISO timestamps (any offset, or blank) to a UTC datetime64 series, NaT where unparseable"""
+    return pd.to_datetime(pd.Series(values), utc=True, errors='coerce', format='ISO8601')
+
+
+def days_since(timestamps, now=None):
+    """Whole days from each timestamp to `now`, as nullable integers"""
+    now = pd.Timestamp.now(tz='UTC') if now is None else pd.Timestamp(now)
+    if now.tzinfo is None:
+        now = now.tz_localize('UTC')
+    return (now - timestamps).dt.days.astype('Int64')
+
+
+def cleanup_frame(dashboards, now=None):
+    """The cleanup report for a frame of exported dashboards, computed column-wise.
+
+    `dashboards` is the flattened export frame of find_dashboards.py. Timestamps are
+    parsed once, and ages, the staleness bucket, the recommendation and a 0-100
+    cleanup priority (higher means a better candidate for removal) are column operations.
+    """
+    views = dashboards['Views'].fillna(0).astype('int64')
+    has_description = dashboards['Has Description'].astype(bool)
+    created_at = dashboards['Created At'].fillna('').astype(str)
+    updated_at = dashboards['Last Updated At'].fillna('').astype(str)
+    first_viewed_at = dashboards['First Viewed At'].fillna('').astype(str)
+    days_since_creation = days_since(parse_timestamps(created_at), now)
+    days_since_update = days_since(parse_timestamps(updated_at), now)
+    update_age = days_since_update.astype('float64')
+
+    recommendation = np.select(
+        [
+            (views == 0).to_numpy(),
+            (views <= 5).to_numpy(),
+            (update_age > STALE_DAYS).to_numpy(),
+            (~has_description).to_numpy(),
+        ],
+        [
+            'NEVER_VIEWED - Consider archiving',
+            'LOW_ENGAGEMENT - Review usage',
+            'STALE - Not updated in 6+ months',
+            'NO_DESCRIPTION - Add description',
+        ],
+        default='ACTIVE - Keep',
+    )
+    bounds = [bound for bound, _ in STALENESS_BUCKETS]
+    labels = [label for _, label in STALENESS_BUCKETS]
+    staleness = pd.cut(update_age, bins=[-np.inf] + bounds, labels=labels, right=False)
+
+    max_views = views.max() if len(views) else 0
+    view_score = 1 - np.log1p(views) / np.log1p(max_views) if max_views > 0 else pd.Series(1.0, index=views.index)
+    staleness_score = (update_age / 365).clip(0, 1).fillna(0)
+    priority = (
+        PRIORITY_WEIGHTS['views'] * view_score
+        + PRIORITY_WEIGHTS['staleness'] * staleness_score
+        + PRIORITY_WEIGHTS['description'] * (~has_description)
+    ).round(1)
+
+    cleanup = pd.DataFrame({
+        'Dashboard_Name': dashboards['Name'],
+        'Dashboard_UUID': dashboards['UUID'],
+        'Project_Name': dashboards['Project Name'],
+        'Space_Name': dashboards['Space Name'],
+        'Total_Views': views,
+        'Created_Date': created_at.str[:10],
+        'Last_Updated_Date': updated_at.str[:10],
+        'Days_Since_Creation': days_since_creation,
+        'Days_Since_Update': days_since_update,
+        'Has_Description': has_description,
+        'Is_Pinned': dashboards['Is Pinned'],
+        'First_Viewed_Date': first_viewed_at.str[:10],
+        'Cleanup_Recommendation': recommendation,
+        'Dashboard_URL_Slug': dashboards['Slug'],
+        'Staleness': staleness,
+        'Cleanup_Priority': priority,
+    })
+    return cleanup.sort_values(['Total_Views', 'Days_Since_Update'], ascending=[True, False])
@@ -0,0 +1,97 @@
+import csv
+
+EXPORT_EXTENSIONS = {'csv': 'csv', 'excel': 'xlsx', 'parquet': 'parquet'}
+
+
+class CsvRowWriter:
+    def __init__(self, path, columns):
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, values):
+        self._writer.writerow(values)
+
+    def close(self):
+        self._file.close()
+
+
+class XlsxRowWriter:
+    """Writes rows with openpyxl's write-only mode, which keeps memory constant"""
+
+    def __init__(self, path, columns, sheet_name='Sheet1'):
+        from openpyxl import Workbook
+        self.path = path
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet(sheet_name)
+        self._sheet.append(columns)
+
+    def write(self, values):
+        self._sheet.append(values)
+
+    def close(self):
+        self._workbook.save(self.path)
+
+
+class ParquetRowWriter:
+    """Buffers rows and writes them as Parquet row groups of `row_group_size` rows"""
+
+    def __init__(self, path, columns, row_group_size=10_000):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError('Parquet export requires pyarrow: pip install pyarrow')
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.path = path
+        self.columns = list(columns)
+        self.row_group_size = row_group_size
+        self._buffer = []
+        self._writer = None
+
+    def write(self, values):
+        self._buffer.append(values)
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer and self._writer is not None:
+            return
+        columns = zip(*self._buffer) if self._buffer else [[] for _ in self.columns]
+        arrays = [self._pa.array(column) for column in columns]
+        # Columns without any values in the first row group would otherwise be typed null
+        arrays = [a.cast(self._pa.string()) if self._pa.types.is_null(a.type) else a for a in arrays]
+        table = self._pa.Table.from_arrays(arrays, names=self.columns)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = table.cast(self._writer.schema)
+        self._writer.write_table(table)
+        self._buffer = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+WRITERS = {'csv': CsvRowWriter, 'excel': XlsxRowWriter, 'parquet': ParquetRowWriter}
+
+
+def stream_export(rows, path, columns, export_method='csv'):
+    """Write dict rows to `path` as they are produced, returning the number written.
+
+    `rows` can be any iterable, e.g. a paginator, so only one row (or one Parquet row
+    group) is held in memory regardless of the size of the export.
+    """
+    if export_method not in WRITERS:
+        raise ValueError(f"Invalid export method: {export_method}. Use {', '.join(repr(m) for m in WRITERS)}.")
+    writer = WRITERS[export_method](path, columns)
+    count = 0
+    try:
+        for row in rows:
+            writer.write([row.get(column) for column in columns])
+            count += 1
+    finally:
+        writer.close()
+    return count
@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+
+from lightdash.pagination import paginate
+
+GROUP_PAGE_SIZE = 100
+# Members returned per request. Larger groups are paged with MEMBER_PAGE_WORKERS requests in flight.
+MEMBER_PAGE_SIZE = 1000
+MEMBER_PAGE_WORKERS = 4
+
+
+def fetch_remaining_members(executor, fetch_members_page, group, first_page,
+                            member_page_size=MEMBER_PAGE_SIZE, member_workers=MEMBER_PAGE_WORKERS):
+    """Page through the members of a group larger than one page, `member_workers` pages at a time.
+
+    `fetch_members_page(group_uuid, offset, limit)` must return one page of members.
+    """
+    members = list(first_page)
+    offsets = count(len(first_page), member_page_size)
+    while True:
+        window = [next(offsets) for _ in range(member_workers)]
+        pages = list(executor.map(
+            lambda offset: fetch_members_page(group['uuid'], offset, member_page_size), window,
+        ))
+        for page in pages:
+            members.extend(page)
+            if len(page) < member_page_size:
+                return members
+
+
+def iter_groups(fetch_groups_page, fetch_members_page, page_size=GROUP_PAGE_SIZE,
+                member_page_size=MEMBER_PAGE_SIZE, member_workers=MEMBER_PAGE_WORKERS):
+    """Yield every group with all of its members, one page of groups at a time.
+
+    `fetch_groups_page(page, page_size, include_members)` must return the `results` object of
+    one page of /org/groups. Groups whose first page of members is full have the rest fetched
+    with `fetch_members_page`, so no group is truncated however large it is.
+    """
+    groups = paginate(
+        lambda page, size: fetch_groups_page(page, size, member_page_size),
+        page_size=page_size,
+        prefetch=2,
+    )
+    with ThreadPoolExecutor(max_workers=member_workers) as executor:
+        for group in groups:
+            members = group.get('members')
+            if members is not None and len(members) >= member_page_size:
+                group = {**group, 'members': fetch_remaining_members(
+                    executor, fetch_members_page, group, members, member_page_size, member_workers,
+                )}
+            yield group
@@ -0,0 +1,251 @@
+import atexit
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+_UUID = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+
+
+def path_template(path):
+    """API path with UUIDs replaced, e.g. /saved/{uuid}, so calls group by endpoint"""
+    return '/' + _UUID.sub('{uuid}', path).lstrip('/')
+
+
+def url_path(url):
+    """Path of a full API URL in the form the client reports it, e.g. /org/users for /api/v1/org/users"""
+    path = urlsplit(url).path
+    return path[len('/api/v1'):] if path.startswith('/api/v1/') else path
+
+
+class RequestEvent:
+    """One LightdashApiClient call, passed to every hook when it completes.
+
+    `cache` is 'hit' or 'miss' when the client has a cache and None otherwise. A cache hit
+    makes no request, so it has no status and no bytes. `error` is set when the call raised.
+    """
+    __slots__ = (
+        'method', 'path', 'template', 'status', 'bytes', 'start_time', 'latency', 'retries', 'cache', 'error',
+        '_start',
+    )
+
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+        self.template = path_template(path)
+        self.status = None
+        self.bytes = 0
+        self.start_time = time.time()
+        self.latency = None
+        self.retries = 0
+        self.cache = None
+        self.error = None
+        self._start = time.perf_counter()
+
+    def finish(self):
+        self.latency = time.perf_counter() - self._start
+
+    @property
+    def endpoint(self):
+        return f'{self.method} {self.template}'
+
+    def __repr__(self):
+        return (f'RequestEvent({self.endpoint}, status={self.status}, bytes={self.bytes}, '
+                f'latency={self.latency}, retries={self.retries}, cache={self.cache}, error={self.error!r})')
+
+
+def run_hooks(hooks, event):
+    """Call every hook with `event`. A failing hook is logged and never breaks the request."""
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception:
+            logger.exception('Request hook %r failed for %s', hook, event.endpoint)
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class RequestStats:
+    """Hook that aggregates calls per endpoint (method and path template).
+
+        stats = RequestStats()
+        client = LightdashApiClient(URL, API_KEY, hooks=[stats])
+        ...
+        print(stats.report())
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self.started_at = time.perf_counter()
+
+    def __call__(self, event):
+        with self._lock:
+            endpoint = self._endpoints.get(event.endpoint)
+            if endpoint is None:
+                endpoint = self._endpoints[event.endpoint] = {
+                    'latencies': [], 'errors': 0, 'retries': 0, 'bytes': 0, 'cache_hits': 0,
+                }
+            endpoint['latencies'].append(event.latency)
+            endpoint['errors'] += event.error is not None
+            endpoint['retries'] += event.retries
+            endpoint['bytes'] += event.bytes
+            endpoint['cache_hits'] += event.cache == 'hit'
+
+    def summary(self):
+        """Per endpoint counts and latency percentiles (seconds), slowest total time first"""
+        with self._lock:
+            endpoints = {name: {**e, 'latencies': sorted(e['latencies'])} for name, e in self._endpoints.items()}
+        rows = []
+        for name, e in endpoints.items():
+            latencies = e['latencies']
+            rows.append({
+                'endpoint': name,
+                'calls': len(latencies),
+                'errors': e['errors'],
+                'retries': e['retries'],
+                'cache_hits': e['cache_hits'],
+                'bytes': e['bytes'],
+                'total': sum(latencies),
+                'p50': percentile(latencies, 50),
+                'p95': percentile(latencies, 95),
+                'p99': percentile(latencies, 99),
+                'max': latencies[-1],
+            })
+        return sorted(rows, key=lambda row: row['total'], reverse=True)
+
+    def report(self):
+        rows = self.summary()
+        if not rows:
+            return 'No Lightdash API calls'
+        lines = [
+            f"{'endpoint':<50} {'calls':>6} {'errors':>6} {'retries':>7} {'cached':>6} {'KB':>9} "
+            f"{'total s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        ]
+        for row in rows:
+            lines.append(
+                f"{row['endpoint'][:50]:<50} {row['calls']:>6} {row['errors']:>6} {row['retries']:>7} "
+                f"{row['cache_hits']:>6} {row['bytes'] / 1024:>9.1f} {row['total']:>8.2f} "
+                f"{row['p50'] * 1000:>8.1f} {row['p95'] * 1000:>8.1f} {row['p99'] * 1000:>8.1f}"
+            )
+        calls = sum(row['calls'] for row in rows)
+        elapsed = time.perf_counter() - self.started_at
+        lines.append(f'{calls} calls in {elapsed:.1f}s')
+        return '\n'.join(lines)
+
+    def print_at_exit(self, file=None):
+        atexit.register(lambda: print('\n' + self.report(), file=file or sys.stderr))
+        return self
+
+
+_shared_stats = None
+_shared_lock = threading.Lock()
+
+
+def shared_stats():
+    """Process-wide RequestStats, printed to stderr when the script exits.
+
+    Clients use it automatically when the LIGHTDASH_REQUEST_STATS environment variable
+    is set, so any script can be profiled without changes.
+    """
+    global _shared_stats
+    with _shared_lock:
+        if _shared_stats is None:
+            _shared_stats = RequestStats().print_at_exit()
+        return _shared_stats
+
+
+def default_hooks(hooks=None):
+    """`hooks` as a list, plus shared_stats() when LIGHTDASH_REQUEST_STATS is set"""
+    hooks = list(hooks or [])
+    if os.environ.get('LIGHTDASH_REQUEST_STATS'):
+        hooks.append(shared_stats())
+    return hooks
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """requests adapter that passes a RequestEvent for every request to its hooks.
+
+    For scripts that call the API through their own requests.Session instead of
+    LightdashApiClient; see instrument_session.
+    """
+
+    def __init__(self, hooks=None, **kwargs):
+        self.hooks = default_hooks(hooks)
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if not self.hooks:
+            return super().send(request, **kwargs)
+        event = RequestEvent(request.method, url_path(request.url))
+        try:
+            response = super().send(request, **kwargs)
+            event.status = response.status_code
+            # Streamed bodies are not read here, so only their Content-Length is known
+            event.bytes = int(response.headers.get('Content-Length') or 0) if kwargs.get('stream') else len(response.content)
+            return response
+        except Exception as e:
+            event.error = str(e)
+            raise
+        finally:
+            event.finish()
+            run_hooks(self.hooks, event)
+
+
+def instrument_session(session, hooks=None, **adapter_kwargs):
+    """Mount an InstrumentedAdapter for http and https on `session`.
+
+    `adapter_kwargs` (e.g. pool_maxsize) go to the adapter. With no hooks and
+    LIGHTDASH_REQUEST_STATS unset the adapter behaves like a plain HTTPAdapter.
+    """
+    adapter = InstrumentedAdapter(hooks, **adapter_kwargs)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class OpenTelemetryHook:
+    """Hook that records each call as an OpenTelemetry client span.
+
+    Requires opentelemetry-api (and an SDK with an exporter configured to send spans anywhere).
+    """
+
+    def __init__(self, tracer=None):
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError('OpenTelemetryHook requires opentelemetry-api: pip install opentelemetry-api')
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer('lightdash.api_client')
+
+    def __call__(self, event):
+        start_ns = int(event.start_time * 1e9)
+        attributes = {
+            'http.request.method': event.method,
+            'url.template': event.template,
+            'http.request.resend_count': event.retries,
+            'http.response.body.size': event.bytes,
+        }
+        if event.status is not None:
+            attributes['http.response.status_code'] = event.status
+        if event.cache is not None:
+            attributes['lightdash.cache'] = event.cache
+        span = self.tracer.start_span(
+            event.endpoint, kind=self._trace.SpanKind.CLIENT, start_time=start_ns, attributes=attributes,
+        )
+        if event.error is not None:
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, event.error))
+        span.end(end_time=start_ns + int(event.latency * 1e9))
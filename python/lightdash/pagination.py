@@ -0,0 +1,91 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+
+def page_items(results):
+    """Items in one page of a paginated `results` object"""
+    return results.get('data', []) if isinstance(results, dict) else []
+
+
+def total_pages(results):
+    """Total page count reported by a page, or None if the endpoint does not report it"""
+    if not isinstance(results, dict):
+        return None
+    pagination = results.get('pagination') or {}
+    # v1 endpoints report totalPageCount, the v2 content endpoint reports totalPages
+    total = pagination.get('totalPageCount', pagination.get('totalPages'))
+    return int(total) if total is not None else None
+
+
+def _has_more(results, page, page_size):
+    total = total_pages(results)
+    if total is not None:
+        return page < total
+    return len(page_items(results)) >= page_size
+
+
+def paginate(fetch_page, page_size=100, prefetch=0):
+    """Lazily yield every item from a page-based endpoint.
+
+    `fetch_page(page, page_size)` must return the `results` object of one page,
+    i.e. {'data': [...], 'pagination': {...}}. Once page 1 reports the total page
+    count, up to `prefetch` following pages are requested concurrently while the
+    caller consumes the current one. Items are always yielded in page order and at
+    most `prefetch + 1` pages are held in memory.
+    """
+    first = fetch_page(1, page_size)
+    yield from page_items(first)
+    total = total_pages(first)
+    if total is None or prefetch <= 0:
+        page, results = 1, first
+        while _has_more(results, page, page_size):
+            page += 1
+            results = fetch_page(page, page_size)
+            yield from page_items(results)
+        return
+
+    pages = iter(range(2, total + 1))
+    with ThreadPoolExecutor(max_workers=prefetch) as executor:
+        window = deque(executor.submit(fetch_page, page, page_size) for page in islice(pages, prefetch))
+        try:
+            while window:
+                results = window.popleft().result()
+                next_page = next(pages, None)
+                if next_page is not None:
+                    window.append(executor.submit(fetch_page, next_page, page_size))
+                yield from page_items(results)
+        finally:
+            for future in window:
+                future.cancel()
+
+
+async def apaginate(fetch_page, page_size=100, prefetch=0):
+    """Async generator version of paginate for coroutine `fetch_page` functions"""
+    first = await fetch_page(1, page_size)
+    for item in page_items(first):
+        yield item
+    total = total_pages(first)
+    if total is None or prefetch <= 0:
+        page, results = 1, first
+        while _has_more(results, page, page_size):
+            page += 1
+            results = await fetch_page(page, page_size)
+            for item in page_items(results):
+                yield item
+        return
+
+    pages = iter(range(2, total + 1))
+    window = deque(asyncio.ensure_future(fetch_page(page, page_size)) for page in islice(pages, prefetch))
+    try:
+        while window:
+            results = await window.popleft()
+            next_page = next(pages, None)
+            if next_page is not None:
+                window.append(asyncio.ensure_future(fetch_page(next_page, page_size)))
+            for item in page_items(results):
+                yield item
+    finally:
+        for task in window:
+            task.cancel()
@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from lightdash.access import PROJECT_ROLES, role_codes
+from lightdash.attributes import email_index, normalize_emails
+
+PLAN_COLUMNS = ['projectUuid', 'email', 'role', 'userUuid', 'userEmail', 'currentRole', 'action', 'detail']
+
+
+def fetch_access_lists(client, project_uuids, max_workers=8):
+    """get_project_access_list of every project, fetched concurrently.
+
+    Returns (access_lists, errors), both keyed by project uuid.
+    """
+    project_uuids = list(dict.fromkeys(project_uuids))
+    access_lists = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(client.get_project_access_list, project_uuid) for project_uuid in project_uuids]
+        for project_uuid, future in zip(project_uuids, futures):
+            try:
+                access_lists[project_uuid] = future.result()
+            except Exception as e:
+                errors[project_uuid] = str(e)
+    return access_lists, errors
+
+
+def plan_projects_access(rows, org_users, access_lists):
+    """Grant, update or skip decision for every project_uuid/email/role row of a permissions file.
+
+    `access_lists` maps project uuids to their get_project_access_list(). Users are matched
+    by case-insensitive email with one join for all projects, and roles are compared as
+    integer codes in PROJECT_ROLES order. A user without access to a project is granted the
+    role, a user with a lower role is upgraded and everyone else is skipped: roles are never
+    lowered. When a user appears on several rows of a project, the row with the highest role
+    is used. Rows of projects missing from `access_lists` are skipped.
+
+    Returns a frame with PLAN_COLUMNS, one row per input row in the same order. `userEmail`
+    is the email as stored in the organization, `action` is 'grant', 'update' or 'skip' and
+    `detail` says why a row is skipped.
+    """
+    users = org_users if isinstance(org_users, pd.DataFrame) else pd.DataFrame.from_records(
+        org_users, columns=['userUuid', 'email'],
+    )
+    user_uuids = normalize_emails(rows['email']).map(email_index(users))
+    plan = pd.DataFrame({
+        'projectUuid': rows['project_uuid'].to_numpy(),
+        'email': rows['email'].to_numpy(),
+        'role': rows['role'].to_numpy(),
+        'userUuid': user_uuids.to_numpy(),
+        'userEmail': user_uuids.map(pd.Series(users['email'].to_numpy(), index=users['userUuid'])).to_numpy(),
+    })
+    current = pd.DataFrame.from_records(
+        [
+            (project_uuid, user['userUuid'], user['role'])
+            for project_uuid, project_access in access_lists.items() for user in project_access
+        ],
+        columns=['projectUuid', 'userUuid', 'currentRole'],
+    ).drop_duplicates(['projectUuid', 'userUuid'])
+    # A left merge keeps the order of the rows
+    plan = plan.merge(current, on=['projectUuid', 'userUuid'], how='left')
+
+    new_codes = pd.Categorical(plan['role'], categories=PROJECT_ROLES).codes
+    current_codes = np.where(plan['currentRole'].notna(), role_codes(plan['currentRole'].fillna('viewer')), -1)
+    known_project = plan['projectUuid'].isin(list(access_lists)).to_numpy()
+    found = plan['userUuid'].notna().to_numpy()
+    valid = new_codes >= 0
+    # Keep the highest valid role of each user on each project, the first row among equal roles
+    candidates = known_project & found & valid
+    ranked = plan[candidates].assign(code=new_codes[candidates]).sort_values('code', ascending=False, kind='stable')
+    duplicate = candidates.copy()
+    duplicate[ranked.index[~ranked.duplicated(['projectUuid', 'userUuid'])]] = False
+
+    conditions = [~known_project, ~valid, ~found, duplicate, current_codes < 0, current_codes < new_codes]
+    plan['action'] = np.select(conditions, ['skip', 'skip', 'skip', 'skip', 'grant', 'update'], 'skip')
+    plan['detail'] = np.select(conditions, [
+        'Project access list unavailable',
+        'Unknown role',
+        'User does not exist in organization',
+        'User has a higher or equal role on another row',
+        '',
+        '',
+    ], 'Already has ' + plan['currentRole'].fillna('').astype(str) + ' access')
+    return plan[PLAN_COLUMNS]
+
+
+def plan_project_access(rows, org_users, project_uuid, project_access):
+    """plan_projects_access for the email/role rows of a single project"""
+    return plan_projects_access(rows.assign(project_uuid=project_uuid), org_users, {project_uuid: project_access})
+
+
+def apply_project_access(client, plan, max_workers=8):
+    """Send the grants and updates of a plan, for all its projects, on one bounded thread pool.
+
+    Retries are up to the client's RetryPolicy, and its RateLimiter caps the request rate
+    across every project. Returns the plan with a `status` column, 'ok', 'error' or
+    'skipped', and the `error` message of failed rows.
+    """
+    def write(project_uuid, email, role, user_uuid, action):
+        if action == 'grant':
+            return client.grant_project_access_to_user(project_uuid, {'sendEmail': False, 'role': role, 'email': email})
+        return client.update_project_access_for_user(project_uuid, user_uuid, {'role': role})
+
+    writes = plan[plan['action'] != 'skip']
+    status = np.full(len(plan), 'skipped', dtype=object)
+    errors = np.full(len(plan), '', dtype=object)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(write, project_uuid, email, role, user_uuid, action)
+            for project_uuid, email, role, user_uuid, action in zip(
+                writes['projectUuid'], writes['userEmail'], writes['role'], writes['userUuid'], writes['action'],
+            )
+        ]
+        for position, future in zip(np.flatnonzero(plan['action'] != 'skip'), futures):
+            try:
+                future.result()
+                status[position] = 'ok'
+            except Exception as e:
+                status[position] = 'error'
+                errors[position] = str(e)
+    return plan.assign(status=status, error=errors)
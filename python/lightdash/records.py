@@ -0,0 +1,202 @@
+"""Compact record types for API objects.
+
+Each record is a dataclass with `__slots__`, so a parsed item is a single small object
+instead of a dict (or several nested dicts). `from_api` builds a record from one item of
+an API response, and `response_items` finds the list of items in a response once.
+"""
+from dataclasses import dataclass
+
+
+def response_items(response):
+    """The list of items in a response, whatever envelope it comes in.
+
+    Handles {"results": {"data": [...]}}, {"results": [...]}, {"data": [...]}, a bare list,
+    or an iterator of items. Returns an empty list for anything else.
+    """
+    if isinstance(response, dict):
+        results = response.get('results', response)
+        if isinstance(results, dict):
+            results = results.get('data')
+        return results if isinstance(results, list) else []
+    if isinstance(response, (str, bytes)) or not hasattr(response, '__iter__'):
+        return []
+    return response
+
+
+def _full_name(first_name, last_name):
+    return f"{first_name or ''} {last_name or ''}".strip()
+
+
+@dataclass
+class User:
+    __slots__ = ('uuid', 'first_name', 'last_name', 'email', 'role', 'group_names')
+    uuid: str
+    first_name: str
+    last_name: str
+    email: str
+    role: str
+    group_names: tuple
+
+    @property
+    def name(self):
+        return _full_name(self.first_name, self.last_name)
+
+    @classmethod
+    def from_api(cls, user):
+        return cls(
+            uuid=user.get('userUuid', ''),
+            first_name=user.get('firstName') or '',
+            last_name=user.get('lastName') or '',
+            email=user.get('email', ''),
+            role=user.get('role', ''),
+            group_names=tuple(group['name'] for group in user.get('groups') or ()),
+        )
+
+
+@dataclass
+class Group:
+    __slots__ = ('uuid', 'name', 'members', 'member_uuids')
+    uuid: str
+    name: str
+    # User records, or None when the response only listed member uuids
+    members: tuple
+    member_uuids: tuple
+
+    @classmethod
+    def from_api(cls, group):
+        members = group.get('members')
+        if members is not None:
+            members = tuple(User.from_api(m) for m in members if isinstance(m, dict))
+            member_uuids = tuple(m.uuid for m in members)
+        else:
+            member_uuids = tuple(group.get('memberUuids') or ())
+        return cls(
+            uuid=group.get('uuid', ''),
+            name=group.get('name', 'Unknown Group'),
+            members=members,
+            member_uuids=member_uuids,
+        )
+
+
+@dataclass
+class Content:
+    """A chart or dashboard item from the v2 content API"""
+    __slots__ = (
+        'uuid', 'name', 'slug', 'description', 'content_type', 'created_at',
+        'created_by_uuid', 'created_by_first_name', 'created_by_last_name',
+        'last_updated_at', 'last_updated_by_uuid', 'last_updated_by_first_name', 'last_updated_by_last_name',
+        'project_uuid', 'project_name', 'organization_uuid', 'organization_name',
+        'space_uuid', 'space_name', 'views', 'first_viewed_at', 'pinned_list_uuid',
+    )
+    uuid: str
+    name: str
+    slug: str
+    description: str
+    content_type: str
+    created_at: str
+    created_by_uuid: str
+    created_by_first_name: str
+    created_by_last_name: str
+    last_updated_at: str
+    last_updated_by_uuid: str
+    last_updated_by_first_name: str
+    last_updated_by_last_name: str
+    project_uuid: str
+    project_name: str
+    organization_uuid: str
+    organization_name: str
+    space_uuid: str
+    space_name: str
+    views: int
+    # Timestamps are kept as the API returns them, so first_viewed_at is None when never viewed
+    first_viewed_at: str
+    # None when the item is not pinned
+    pinned_list_uuid: str
+
+    @property
+    def created_by_name(self):
+        return _full_name(self.created_by_first_name, self.created_by_last_name)
+
+    @property
+    def last_updated_by_name(self):
+        return _full_name(self.last_updated_by_first_name, self.last_updated_by_last_name)
+
+    @property
+    def is_pinned(self):
+        return self.pinned_list_uuid is not None
+
+    @property
+    def has_description(self):
+        return bool((self.description or '').strip())
+
+    @classmethod
+    def from_api(cls, item):
+        created_by = item.get('createdBy') or {}
+        last_updated_by = item.get('lastUpdatedBy') or {}
+        project = item.get('project') or {}
+        organization = item.get('organization') or {}
+        space = item.get('space') or {}
+        pinned_list = item.get('pinnedList')
+        return cls(
+            uuid=item.get('uuid', ''),
+            name=item.get('name', ''),
+            slug=item.get('slug', ''),
+            description=item.get('description', ''),
+            content_type=item.get('contentType', ''),
+            created_at=item.get('createdAt', ''),
+            created_by_uuid=created_by.get('uuid', ''),
+            created_by_first_name=created_by.get('firstName', ''),
+            created_by_last_name=created_by.get('lastName', ''),
+            last_updated_at=item.get('lastUpdatedAt', ''),
+            last_updated_by_uuid=last_updated_by.get('uuid', ''),
+            last_updated_by_first_name=last_updated_by.get('firstName', ''),
+            last_updated_by_last_name=last_updated_by.get('lastName', ''),
+            project_uuid=project.get('uuid', ''),
+            project_name=project.get('name', ''),
+            organization_uuid=organization.get('uuid', ''),
+            organization_name=organization.get('name', ''),
+            space_uuid=space.get('uuid', ''),
+            space_name=space.get('name', ''),
+            views=item.get('views') or 0,
+            first_viewed_at=item.get('firstViewedAt', ''),
+            pinned_list_uuid=pinned_list.get('uuid', '') if pinned_list else None,
+        )
+
+    def to_dict(self):
+        """Nested dict in the layout find_dashboards.py has always exported to JSON"""
+        return {
+            'uuid': self.uuid,
+            'name': self.name,
+            'slug': self.slug,
+            'description': self.description,
+            'content_type': self.content_type,
+            'created_at': self.created_at,
+            'created_by': {
+                'uuid': self.created_by_uuid,
+                'name': self.created_by_name,
+                'first_name': self.created_by_first_name,
+                'last_name': self.created_by_last_name,
+            },
+            'last_updated_at': self.last_updated_at,
+            'last_updated_by': {
+                'uuid': self.last_updated_by_uuid,
+                'name': self.last_updated_by_name,
+                'first_name': self.last_updated_by_first_name,
+                'last_name': self.last_updated_by_last_name,
+            },
+            'project': {'uuid': self.project_uuid, 'name': self.project_name},
+            'organization': {'uuid': self.organization_uuid, 'name': self.organization_name},
+            'space': {'uuid': self.space_uuid, 'name': self.space_name},
+            'views': self.views,
+            'first_viewed_at': self.first_viewed_at,
+            'pinned_list_uuid': self.pinned_list_uuid,
+            'is_pinned': self.is_pinned,
+            'has_description': self.has_description,
+            'url_slug': self.slug,
+            'days_since_creation': None,
+            'days_since_last_update': None,
+        }
+
+
+# find_dashboards.py parses dashboards from the content API
+Dashboard = Content
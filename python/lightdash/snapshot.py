@@ -0,0 +1,102 @@
+import json
+import sqlite3
+from datetime import datetime, timezone
+
+
+class ContentSnapshot:
+    """SQLite store of content items (as returned by /api/v2/content) keyed by uuid.
+
+    Each item is stored with its project and `lastUpdatedAt`, so a later run only needs to
+    fetch content updated since `last_updated_at()` and `merge` it in. Every merge also
+    appends the items' view counts to a history table.
+
+    The content API has no "changed since" filter for views or deletions: view counts of
+    items that were not edited, and deleted items, are only picked up by `replace`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS content ('
+            'uuid TEXT PRIMARY KEY, content_type TEXT, project_uuid TEXT, last_updated_at TEXT, data TEXT)'
+        )
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS views ('
+            'uuid TEXT, observed_at TEXT, views INTEGER, PRIMARY KEY (uuid, observed_at))'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS content_project ON content (project_uuid, last_updated_at)')
+        self._db.commit()
+
+    @staticmethod
+    def _project_filter(project_uuids, content_types):
+        clauses, params = [], []
+        for column, values in (('project_uuid', project_uuids), ('content_type', content_types)):
+            if values:
+                clauses.append(f"{column} IN ({', '.join('?' for _ in values)})")
+                params.extend(values)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def last_updated_at(self, project_uuids=None, content_types=None):
+        """Most recent `lastUpdatedAt` in the snapshot, or None if it has no matching items"""
+        where, params = self._project_filter(project_uuids, content_types)
+        return self._db.execute(f'SELECT MAX(last_updated_at) FROM content{where}', params).fetchone()[0]
+
+    def merge(self, items, observed_at=None):
+        """Insert or update items, returning (new, updated) counts"""
+        observed_at = observed_at or datetime.now(timezone.utc).isoformat()
+        new = updated = 0
+        with self._db:
+            for item in items:
+                uuid = item['uuid']
+                exists = self._db.execute('SELECT 1 FROM content WHERE uuid = ?', (uuid,)).fetchone()
+                self._db.execute(
+                    'INSERT OR REPLACE INTO content VALUES (?, ?, ?, ?, ?)',
+                    (
+                        uuid, item.get('contentType'), (item.get('project') or {}).get('uuid'),
+                        item.get('lastUpdatedAt') or '', json.dumps(item),
+                    ),
+                )
+                self._db.execute(
+                    'INSERT OR REPLACE INTO views VALUES (?, ?, ?)', (uuid, observed_at, item.get('views') or 0)
+                )
+                if exists:
+                    updated += 1
+                else:
+                    new += 1
+        return new, updated
+
+    def replace(self, items, project_uuids=None, content_types=None, observed_at=None):
+        """Merge a full listing and delete matching items that are no longer in it.
+
+        Returns (new, updated, deleted) counts.
+        """
+        items = list(items)
+        new, updated = self.merge(items, observed_at)
+        where, params = self._project_filter(project_uuids, content_types)
+        seen = {item['uuid'] for item in items}
+        stale = [uuid for (uuid,) in self._db.execute(f'SELECT uuid FROM content{where}', params) if uuid not in seen]
+        with self._db:
+            self._db.executemany('DELETE FROM content WHERE uuid = ?', [(uuid,) for uuid in stale])
+        return new, updated, len(stale)
+
+    def items(self, project_uuids=None, content_types=None):
+        """Stored items, most recently updated first"""
+        where, params = self._project_filter(project_uuids, content_types)
+        for (data,) in self._db.execute(f'SELECT data FROM content{where} ORDER BY last_updated_at DESC', params):
+            yield json.loads(data)
+
+    def view_history(self, uuid):
+        """(observed_at, views) pairs recorded for an item, oldest first"""
+        return self._db.execute(
+            'SELECT observed_at, views FROM views WHERE uuid = ? ORDER BY observed_at', (uuid,)
+        ).fetchall()
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
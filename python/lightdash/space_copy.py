@@ -0,0 +1,207 @@
+import threading
+
+from lightdash.task_graph import TaskGraph
+
+
+def _is_dashboard_chart(tile):
+    return tile['type'] == 'saved_chart' and tile['properties'].get('belongsToDashboard') == True
+
+
+class SpaceCopier:
+    """Copy every space, chart and dashboard from one project to another.
+
+    The copy is planned as a dependency graph: a chart or dashboard waits for its space,
+    charts that belong to a dashboard wait for the dashboard, and the final tile patch of
+    a dashboard waits for every chart its tiles reference. Independent nodes run
+    concurrently on `max_workers` threads, and every source object is fetched once.
+
+    Pass a CopyJournal to record every created object as it is created. Objects already
+    in the journal are neither fetched nor created again, so an interrupted copy can be
+    re-run and only the remaining work is done.
+    """
+
+    def __init__(self, source, target, max_workers=8, journal=None):
+        self.source = source
+        self.target = target
+        self.max_workers = max_workers
+        self.journal = journal
+        self.space_uuid_map = {}
+        self.chart_uuid_map = {}
+        self.dashboard_uuid_map = {}
+        self.new_dashboards = {}
+        self.errors = {}
+        self.stats = {}
+        self._lock = threading.Lock()
+        if journal is not None:
+            self.space_uuid_map.update(journal.targets('space'))
+            self.chart_uuid_map.update(journal.targets('chart'))
+            self.dashboard_uuid_map.update(journal.targets('dashboard'))
+            for source_uuid, target_uuid in self.dashboard_uuid_map.items():
+                entry = journal.get('dashboard', source_uuid)
+                self.new_dashboards[source_uuid] = {'uuid': target_uuid, 'filters': entry.get('filters')}
+
+    def _record(self, uuid_map, source_uuid, target_uuid):
+        with self._lock:
+            uuid_map[source_uuid] = target_uuid
+
+    def _journal(self, kind, source_uuid, target_uuid=None, **extra):
+        if self.journal is not None:
+            self.journal.record(kind, source_uuid, target_uuid, **extra)
+
+    def _is_done(self, kind, source_uuid):
+        return self.journal is not None and (kind, source_uuid) in self.journal
+
+    def _dashboard_is_done(self, dashboard_uuid):
+        if self._is_done('tiles', dashboard_uuid):
+            return True
+        entry = self.journal.get('dashboard', dashboard_uuid) if self.journal is not None else None
+        return entry is not None and not entry.get('hasTiles')
+
+    def fetch_source(self):
+        """Fetch every space with the charts and dashboards that still need copying"""
+        print('Getting all spaces')
+        spaces_summary = self.source.spaces(summary=True)
+        pending = [
+            {
+                **space,
+                'queries': [q for q in space['queries'] if not self._is_done('chart', q['uuid'])],
+                'dashboards': [d for d in space['dashboards'] if not self._dashboard_is_done(d['uuid'])],
+            }
+            for space in spaces_summary
+        ]
+        print('Getting all charts and dashboards')
+        fetch_errors = []
+        full_spaces = self.source.spaces_summary_to_detail(pending, errors=fetch_errors)
+        for error in fetch_errors:
+            self.errors[(f'fetch_{error["type"]}', error['uuid'])] = error['error']
+        return full_spaces
+
+    def copy_space(self, space):
+        new_space = self.target.create_empty_space({'name': space['name'], 'isPrivate': space['isPrivate']})
+        print(f'Copied space: {space["name"]}')
+        self._record(self.space_uuid_map, space['uuid'], new_space['uuid'])
+        self._journal('space', space['uuid'], new_space['uuid'])
+
+    def copy_chart(self, chart):
+        new_chart = self.target.create_saved_chart({**chart, 'spaceUuid': self.space_uuid_map[chart['spaceUuid']]})
+        print(f'Copied chart: {chart["name"]}')
+        self._record(self.chart_uuid_map, chart['uuid'], new_chart['uuid'])
+        self._journal('chart', chart['uuid'], new_chart['uuid'])
+
+    def copy_dashboard(self, dashboard):
+        new_dashboard = {
+            'name': dashboard['name'],
+            'description': dashboard.get('description', ''),
+            'spaceUuid': self.space_uuid_map[dashboard['spaceUuid']],
+            'tiles': []
+        }
+        if dashboard.get('filters'):
+            new_dashboard['filters'] = dashboard['filters']
+        new_dashboard = self.target.create_dashboard(new_dashboard)
+        print(f'Copied dashboard: {dashboard["name"]}')
+        self._record(self.dashboard_uuid_map, dashboard['uuid'], new_dashboard['uuid'])
+        self._record(self.new_dashboards, dashboard['uuid'], new_dashboard)
+        self._journal(
+            'dashboard', dashboard['uuid'], new_dashboard['uuid'],
+            filters=new_dashboard.get('filters'), hasTiles=bool(dashboard.get('tiles')),
+        )
+
+    def copy_dashboard_chart(self, dashboard, tile):
+        print(f'Copying chart that belongs to dashboard: {tile["properties"]["chartName"]}')
+        chart = self.source.saved_chart(tile['properties']['savedChartUuid'])
+        if 'spaceUuid' in chart:
+            chart['spaceUuid'] = self.space_uuid_map[chart['spaceUuid']]
+        new_chart = self.target.create_saved_chart({
+            **chart,
+            'dashboardUuid': self.dashboard_uuid_map[dashboard['uuid']],
+        })
+        self._record(self.chart_uuid_map, chart['uuid'], new_chart['uuid'])
+        self._journal('chart', chart['uuid'], new_chart['uuid'])
+
+    def patch_tiles(self, dashboard):
+        new_dashboard = self.new_dashboards[dashboard['uuid']]
+        new_tiles = []
+        for tile in dashboard['tiles']:
+            if tile['type'] == 'saved_chart':
+                chart_uuid = tile['properties']['savedChartUuid']
+                new_tiles.append({
+                    **tile,
+                    'properties': {
+                        **tile['properties'],
+                        # try to get the new id but if it was already a broken reference, use the old id
+                        'savedChartUuid': self.chart_uuid_map.get(chart_uuid, chart_uuid)
+                    }
+                })
+            else:
+                new_tiles.append(tile)
+        self.target.update_dashboard(new_dashboard['uuid'], {
+            'filters': new_dashboard.get('filters'),
+            'tiles': new_tiles
+        })
+        print(f'Copied {len(new_tiles)} tiles for dashboard: {dashboard["name"]}')
+        self._journal('tiles', dashboard['uuid'], new_dashboard['uuid'])
+
+    def build_graph(self, full_spaces):
+        graph = TaskGraph()
+        for space in full_spaces:
+            if space['uuid'] not in self.space_uuid_map:
+                graph.add(('space', space['uuid']), lambda s=space: self.copy_space(s), phase='spaces')
+        for space in full_spaces:
+            for chart in space['queries']:
+                graph.add(
+                    ('chart', chart['uuid']), lambda c=chart: self.copy_chart(c),
+                    deps=[('space', chart['spaceUuid'])], phase='charts',
+                )
+            for dashboard in space['dashboards']:
+                dashboard_key = ('dashboard', dashboard['uuid'])
+                if dashboard['uuid'] not in self.dashboard_uuid_map:
+                    graph.add(
+                        dashboard_key, lambda d=dashboard: self.copy_dashboard(d),
+                        deps=[('space', dashboard['spaceUuid'])], phase='dashboards',
+                    )
+                tiles = dashboard.get('tiles')
+                if not tiles:
+                    continue
+                tile_deps = [dashboard_key]
+                for tile in tiles:
+                    if tile['type'] != 'saved_chart':
+                        continue
+                    chart_uuid = tile['properties']['savedChartUuid']
+                    chart_key = ('chart', chart_uuid)
+                    if _is_dashboard_chart(tile) and chart_uuid not in self.chart_uuid_map:
+                        chart_key = ('dashboard_chart', chart_uuid)
+                        graph.add(
+                            chart_key, lambda d=dashboard, t=tile: self.copy_dashboard_chart(d, t),
+                            deps=[dashboard_key], phase='dashboard charts',
+                        )
+                    tile_deps.append(chart_key)
+                graph.add(
+                    ('tiles', dashboard['uuid']),
+                    lambda d=dashboard: self.patch_tiles(d),
+                    deps=tile_deps, phase='tiles',
+                )
+        return graph
+
+    def run(self):
+        """Copy everything and return per-phase statistics"""
+        full_spaces = self.fetch_source()
+        graph = self.build_graph(full_spaces)
+        if self.journal is not None and self.journal.entries:
+            print(f'Resuming: {len(self.journal.entries)} steps already completed')
+        print(f'Copying {len(graph)} objects with {self.max_workers} workers')
+        _, errors, self.stats = graph.run(max_workers=self.max_workers)
+        self.errors.update({key: str(error) for key, error in errors.items()})
+        return self.stats
+
+    def print_report(self):
+        print('\nCopy summary:')
+        for phase_stats in self.stats.values():
+            print(f'  {phase_stats}')
+        if self.errors:
+            print(f'\n{len(self.errors)} object(s) were not copied:')
+            for (kind, uuid), error in self.errors.items():
+                print(f'  {kind} {uuid}: {error}')
+            by_kind = {}
+            for kind, _ in self.errors:
+                by_kind[kind] = by_kind.get(kind, 0) + 1
+            print('\nCopy incomplete, failed: ' + ', '.join(f'{count} {kind}' for kind, count in sorted(by_kind.items())))
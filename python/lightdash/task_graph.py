@@ -0,0 +1,102 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class PhaseStats:
+    """Counts and wall time for all tasks in one phase of a TaskGraph run"""
+
+    def __init__(self, name):
+        self.name = name
+        self.succeeded = 0
+        self.failed = 0
+        self.skipped = 0
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def elapsed(self):
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+    @property
+    def throughput(self):
+        """Completed tasks per second of wall time"""
+        return (self.succeeded + self.failed) / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (
+            f'{self.name}: {self.succeeded} ok, {self.failed} failed, {self.skipped} skipped '
+            f'in {self.elapsed:.1f}s ({self.throughput:.1f}/s)'
+        )
+
+
+class TaskGraph:
+    """Run tasks concurrently as soon as all of their dependencies have succeeded.
+
+    Tasks whose dependencies failed are skipped. Dependencies on keys that were never
+    added are ignored, so optional dependencies can be declared unconditionally.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+
+    def add(self, key, fn, deps=(), phase='default'):
+        self._tasks[key] = (fn, tuple(deps), phase)
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def run(self, max_workers=8):
+        """Execute the graph, returning (results, errors, stats by phase)"""
+        deps = {key: {d for d in task_deps if d in self._tasks} for key, (_, task_deps, _) in self._tasks.items()}
+        dependents = {key: [] for key in self._tasks}
+        for key, key_deps in deps.items():
+            for dep in key_deps:
+                dependents[dep].append(key)
+        stats = {}
+        for _, _, phase in self._tasks.values():
+            stats.setdefault(phase, PhaseStats(phase))
+
+        results, errors = {}, {}
+        remaining = {key: len(key_deps) for key, key_deps in deps.items()}
+        ready = [key for key, count in remaining.items() if count == 0]
+
+        def skip(key):
+            for dependent in dependents[key]:
+                if dependent not in errors:
+                    errors[dependent] = RuntimeError(f'Skipped because {key} did not complete')
+                    stats[self._tasks[dependent][2]].skipped += 1
+                    skip(dependent)
+
+        def timed(key):
+            fn, _, phase = self._tasks[key]
+            phase_stats = stats[phase]
+            if phase_stats.started_at is None:
+                phase_stats.started_at = time.monotonic()
+            return fn()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running = {}
+            while ready or running:
+                for key in ready:
+                    running[executor.submit(timed, key)] = key
+                ready = []
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    phase_stats = stats[self._tasks[key][2]]
+                    phase_stats.finished_at = time.monotonic()
+                    try:
+                        results[key] = future.result()
+                    except Exception as e:
+                        errors[key] = e
+                        phase_stats.failed += 1
+                        skip(key)
+                        continue
+                    phase_stats.succeeded += 1
+                    for dependent in dependents[key]:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0 and dependent not in errors:
+                            ready.append(dependent)
+        return results, errors, stats